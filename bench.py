@@ -0,0 +1,198 @@
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+
+
+# A suite is a module with a benchmarks() function returning (name, function)
+# pairs. Run one with e.g.
+#
+#     python3 -m algutils.bench primes --output results.json
+#     python3 -m algutils.bench primes --baseline results.json --tolerance 0.25
+SUITES = {
+    "primes": "algutils.primes.benchmarks",
+}
+
+
+class Result(typing.NamedTuple):
+    seconds: float
+    peak_bytes: int
+
+
+class Regression(typing.NamedTuple):
+    name: str
+    metric: str
+    baseline: float
+    value: float
+
+
+# Fast benchmarks are called repeatedly until a timing takes at least this
+# long, to be less sensitive to noise.
+MIN_TIMING_SECONDS = 0.05
+
+
+def run_benchmark(function: typing.Callable[[], typing.Any], repeat: int) -> Result:
+    # The fastest of repeat timings per call, then one more call under
+    # tracemalloc, which slows Python code down too much to time it at once.
+    number = 1
+    while (seconds := _time(function, number)) < MIN_TIMING_SECONDS:
+        number *= 2
+
+    seconds = min(
+        [seconds] + [_time(function, number) for _ in range(repeat - 1)]
+    ) / number
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(seconds=seconds, peak_bytes=peak_bytes)
+
+
+def run_suite(
+    suite: str,
+    repeat: int = 3,
+    names: typing.Optional[typing.Container[str]] = None,
+    log: typing.Optional[typing.TextIO] = None,
+) -> dict[str, Result]:
+    module = importlib.import_module(SUITES[suite])
+    results = {}
+
+    for name, function in module.benchmarks():
+        if names is not None and name not in names:
+            continue
+
+        results[name] = run_benchmark(function, repeat=repeat)
+
+        if log is not None:
+            print(
+                f"{name:40} {results[name].seconds:10.4f}s"
+                f" {results[name].peak_bytes / 2**20:10.2f}MiB",
+                file=log,
+            )
+
+    return results
+
+
+def compare(
+    results: dict[str, Result],
+    baseline: dict[str, Result],
+    tolerance: float,
+    memory_tolerance: float,
+) -> list[Regression]:
+    # Benchmarks more than tolerance (a fraction) slower, or memory_tolerance
+    # hungrier, than their baseline. Those missing from either side are ignored.
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        for metric, metric_tolerance in [
+            ("seconds", tolerance),
+            ("peak_bytes", memory_tolerance),
+        ]:
+            value = getattr(result, metric)
+            baseline_value = getattr(baseline[name], metric)
+
+            if value > baseline_value * (1 + metric_tolerance):
+                regressions.append(
+                    Regression(
+                        name=name,
+                        metric=metric,
+                        baseline=baseline_value,
+                        value=value,
+                    )
+                )
+
+    return regressions
+
+
+def to_json(suite: str, results: dict[str, Result]) -> dict[str, typing.Any]:
+    return {
+        "suite": suite,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": {name: result._asdict() for name, result in results.items()},
+    }
+
+
+def from_json(data: dict[str, typing.Any]) -> dict[str, Result]:
+    return {name: Result(**result) for name, result in data["results"].items()}
+
+
+def _time(function: typing.Callable[[], typing.Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    return time.perf_counter() - start
+
+
+def main(argv: typing.Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a benchmark suite and compare it against a baseline."
+    )
+    parser.add_argument("suite", choices=sorted(SUITES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--only", action="append", metavar="NAME", help="Run only these benchmarks."
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against this JSON file.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown against the baseline, as a fraction.",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed peak memory growth against the baseline, as a fraction.",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.suite, repeat=args.repeat, names=args.only, log=sys.stdout
+    )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(to_json(args.suite, results), f, indent=2)
+            f.write("\n")
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = from_json(json.load(f))
+
+    regressions = compare(
+        results,
+        baseline,
+        tolerance=args.tolerance,
+        memory_tolerance=args.memory_tolerance,
+    )
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name} {regression.metric}:"
+            f" {regression.baseline:.6g} -> {regression.value:.6g}",
+            file=sys.stderr,
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
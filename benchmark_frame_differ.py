@@ -0,0 +1,138 @@
+import argparse
+import math
+import time
+import typing
+
+import numpy as np
+
+from algutils.braille_canvas import BrailleCanvas, ScrollingBrailleCanvas
+from algutils.frame_differ import FrameDiffer, full_repaint
+
+
+# Bytes written per frame by FrameDiffer against full repaints, and the time
+# taken to draw and render each frame, for a few typical live views. Run with
+# python3 -m algutils.benchmark_frame_differ.
+
+
+def _streaming_plot(
+    char_rows: int, char_columns: int, frames: int
+) -> typing.Iterator[str]:
+    # Like plot-stdin: the last samples of a random walk, redrawn from scratch
+    # on a new canvas whenever one arrives.
+    rng = np.random.default_rng(0)
+    walk = np.cumsum(rng.normal(size=frames + char_columns))
+
+    for i in range(frames):
+        series = walk[i : i + char_columns]
+        canvas = BrailleCanvas(char_rows, char_columns)
+        bounds_y, bounds_x = canvas.bounds()
+        ys = (series.max() - series) / (np.ptp(series) or 1) * bounds_y
+        xs = np.linspace(0, bounds_x, len(series))
+        canvas.draw_polyline(np.stack([ys, xs], axis=1))
+
+        yield str(canvas)
+
+
+def _scrolling_plot(
+    char_rows: int, char_columns: int, frames: int
+) -> typing.Iterator[str]:
+    # The same random walk on a ScrollingBrailleCanvas, on a fixed scale,
+    # scrolled by a character per sample with only its newest segment drawn.
+    # Every row is rendered again after each scroll.
+    rng = np.random.default_rng(0)
+    walk = np.cumsum(rng.normal(size=frames + char_columns))
+
+    canvas = ScrollingBrailleCanvas(char_rows, char_columns)
+    bounds_y, bounds_x = canvas.bounds()
+    ys = (walk.max() - walk) / (np.ptp(walk) or 1) * bounds_y
+    x = bounds_x - BrailleCanvas.CHAR_WIDTH / 2
+
+    for i in range(frames):
+        canvas.scroll()
+        canvas.draw_polyline(
+            [
+                (ys[i + char_columns - 1], x - BrailleCanvas.CHAR_WIDTH),
+                (ys[i + char_columns], x),
+            ]
+        )
+
+        yield str(canvas)
+
+
+def _moving_marker(
+    char_rows: int, char_columns: int, frames: int
+) -> typing.Iterator[str]:
+    # A static curve, with a marker moving along it and its value as text.
+    canvas = BrailleCanvas(char_rows, char_columns)
+    bounds_y, bounds_x = canvas.bounds()
+    xs = np.linspace(0, bounds_x, 4 * char_columns)
+    ys = (np.sin(xs / bounds_x * 4 * math.pi) + 1) / 2 * bounds_y
+    canvas.draw_polyline(np.stack([ys, xs], axis=1))
+    background = str(canvas).split("\n")
+
+    for i in range(frames):
+        x = i % char_columns
+        y = int((math.sin(x / char_columns * 4 * math.pi) + 1) / 2 * (char_rows - 1))
+        lines = list(background)
+        lines[y] = lines[y][:x] + "●" + lines[y][x + 1 :]
+        lines[0] = f"x = {x:4}" + lines[0][8:]
+
+        yield "\n".join(lines)
+
+
+def _noise(char_rows: int, char_columns: int, frames: int) -> typing.Iterator[str]:
+    # The worst case, with every dot random in every frame.
+    rng = np.random.default_rng(0)
+    canvas = BrailleCanvas(char_rows, char_columns)
+
+    for _ in range(frames):
+        canvas.cells = rng.integers(0, 256, size=canvas.cells.shape, dtype=np.uint8)
+        canvas.mark_dirty()
+
+        yield str(canvas)
+
+
+WORKLOADS = {
+    "streaming_plot": _streaming_plot,
+    "scrolling_plot": _scrolling_plot,
+    "moving_marker": _moving_marker,
+    "noise": _noise,
+}
+
+
+def main(argv: typing.Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Bytes per frame written by FrameDiffer and by full repaints,"
+        " and milliseconds per frame rendered."
+    )
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    print(f"{'workload':20} {'full':>12} {'diff':>12} {'ratio':>8} {'render ms':>10}")
+
+    for name, workload in WORKLOADS.items():
+        differ = FrameDiffer()
+        full_bytes = diff_bytes = 0
+        render_seconds = 0.0
+
+        frames = workload(args.rows, args.columns, args.frames)
+        for _ in range(args.frames):
+            start = time.perf_counter()
+            frame = next(frames)
+            render_seconds += time.perf_counter() - start
+
+            full_bytes += len(full_repaint(frame).encode())
+            diff_bytes += len(differ.diff(frame).encode())
+
+        print(
+            f"{name:20} {full_bytes / args.frames:12.0f}"
+            f" {diff_bytes / args.frames:12.0f}"
+            f" {diff_bytes / full_bytes:8.3f}"
+            f" {render_seconds / args.frames * 1000:10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
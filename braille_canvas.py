@@ -1,14 +1,15 @@
+import bisect
 from collections import defaultdict
 from itertools import chain
 import math
+import random
 import typing
 
 import numpy as np
 
+from algutils import frame_differ
 from algutils import utils
-from algutils.char_array import char_array_to_string, string_to_char_array
-from algutils.np_array_to_braille import np_array_to_braille
-from algutils.ordered_set import OrderedSet
+from algutils.int_to_braille import int_to_braille
 from algutils.utils import EPSILON
 
 
@@ -95,27 +96,57 @@ class BrailleCanvas:
         (CHAR_DOTS_RIGHT_PADDING - CHAR_DOTS_LEFT_PADDING) / 2,
     )
     CANVAS_ZERO_YX_COORDS = CHAR_DOTS_COORDS[0][0]
+    # Midpoints between consecutive dot rows/columns of a character, where the
+    # closest one changes.
+    CHAR_DOTS_ROWS_BOUNDARIES = (
+        CHAR_DOTS_COORDS[:-1, 0, 0] + CHAR_DOTS_COORDS[1:, 0, 0]
+    ) / 2
+    CHAR_DOTS_COLS_BOUNDARIES = (
+        CHAR_DOTS_COORDS[0, :-1, 1] + CHAR_DOTS_COORDS[0, 1:, 1]
+    ) / 2
+    # Distance between consecutive points draw_line samples.
+    LINE_STEP = 0.5
 
     def __init__(self, char_rows: int, char_columns: int) -> None:
         self.char_rows = char_rows
         self.char_columns = char_columns
 
-        self.dots = np.full(
-            shape=(
-                _BC.DOTS_ROWS_IN_CHAR * char_rows,
-                _BC.DOTS_COLS_IN_CHAR * char_columns,
-            ),
-            fill_value=False,
-        )
+        self._cells = np.zeros(shape=(char_rows, char_columns), dtype=np.uint8)
 
         self._texts_row_col_to_strings: defaultdict[tuple[int, int], list[str]]
         self._texts_row_col_to_strings = defaultdict(list)
 
+        # __str__ only renders again the rows changed since the last time.
+        self._rows_strings = [""] * char_rows
+        self._dirty_rows = np.full(char_rows, True)
+
+        self._bounds = tuple(self.bounds().tolist())
+
+        # Coordinates of the dots of each dot row/column, increasing.
+        start_y, start_x = _BC.CANVAS_ZERO_YX_COORDS
+        self._dots_ys = (
+            np.arange(char_rows)[:, np.newaxis] * _BC.CHAR_HEIGHT
+            + _BC.CHAR_DOTS_COORDS[:, 0, 0]
+            - start_y
+        ).ravel()
+        self._dots_xs = (
+            np.arange(char_columns)[:, np.newaxis] * _BC.CHAR_WIDTH
+            + _BC.CHAR_DOTS_COORDS[0, :, 1]
+            - start_x
+        ).ravel()
+
     def draw_point(self, yx_coords: tuple[int, int]) -> None:
         if self._out_of_bounds(yx_coords):
             return
 
-        self.dots[self._closest_dot_row_col(yx_coords)] = True
+        self._set_dots(*self._closest_dot_row_col(yx_coords))
+
+    def draw_points(self, yx_coords: np.ndarray) -> None:
+        """draw_point for every (y, x) row of an array, all at once."""
+        yx_coords = np.asarray(yx_coords, dtype=float).reshape(-1, 2)
+        yx_coords = yx_coords[~self._out_of_bounds_mask(yx_coords)]
+
+        self._set_dots(*self.coords_to_dots(yx_coords))
 
     def draw_line(
         self,
@@ -123,56 +154,162 @@ class BrailleCanvas:
         stop_yx_coords: tuple[int, int],
         offset: float = 0.0,
     ) -> None:
-        start_yx_coords = tuple(utils.jiggle_vector(list(start_yx_coords)))
-        stop_yx_coords = tuple(utils.jiggle_vector(list(stop_yx_coords)))
+        self.draw_lines([start_yx_coords], [stop_yx_coords], offset=offset)
 
-        if 2 * offset >= math.dist(start_yx_coords, stop_yx_coords):
-            return
+    def draw_lines(
+        self,
+        start_yx_coords: np.ndarray,
+        stop_yx_coords: np.ndarray,
+        offset: float = 0.0,
+    ) -> None:
+        """draw_line for every pair of (y, x) rows of two arrays, all at once."""
+        starts = np.asarray(start_yx_coords, dtype=float).reshape(-1, 2)
+        stops = np.asarray(stop_yx_coords, dtype=float).reshape(-1, 2)
+        starts = _jiggle(starts)
+        stops = _jiggle(stops)
+
+        lengths = np.hypot(*(stops - starts).T)
+        long_enough = 2 * offset < lengths
+        starts = starts[long_enough]
+        stops = stops[long_enough]
+
+        offset_vectors = (stops - starts) / lengths[long_enough, np.newaxis] * offset
+        starts = starts + offset_vectors
+        stops = stops - offset_vectors
+
+        samples, line_indices = self._lines_samples(starts, stops)
+        in_bounds = ~self._out_of_bounds_mask(samples)
+        dots_rows, dots_cols = self.coords_to_dots(samples[in_bounds])
+
+        self._set_dots(
+            *_thin_lines_dots(dots_rows, dots_cols, line_indices[in_bounds])
+        )
 
-        difference = utils.vectors_difference(
-            list(stop_yx_coords),
-            list(start_yx_coords),
+    def draw_polyline(self, yx_coords: np.ndarray) -> None:
+        """Lines between consecutive (y, x) rows of an array."""
+        yx_coords = np.asarray(yx_coords, dtype=float).reshape(-1, 2)
+        self.draw_lines(yx_coords[:-1], yx_coords[1:])
+
+    def draw_circle(self, centre_yx_coords: tuple[float, float], radius: float) -> None:
+        """The dots closest to a circle, one dot thick.
+
+        Like the midpoint circle algorithm, but on the uneven dot grid: each
+        crossing of the circle with a dot row or a dot column gets the dot
+        closest to it. In order around the circle, consecutive crossings are
+        on the same cell of the grid, so their dots are at most one apart
+        whatever the slope, and dots at corners are then dropped as for lines.
+        """
+        cy, cx = centre_yx_coords
+
+        ys = self._dots_ys[np.abs(self._dots_ys - cy) <= radius]
+        xs = self._dots_xs[np.abs(self._dots_xs - cx) <= radius]
+        half_widths = np.sqrt(radius**2 - (ys - cy) ** 2)
+        half_heights = np.sqrt(radius**2 - (xs - cx) ** 2)
+
+        # Also the rightmost point, so that a circle too small to cross any
+        # dot row or column still gets its closest dot.
+        crossings = np.concatenate(
+            [
+                np.stack([ys, cx - half_widths], axis=1),
+                np.stack([ys, cx + half_widths], axis=1),
+                np.stack([cy - half_heights, xs], axis=1),
+                np.stack([cy + half_heights, xs], axis=1),
+                [(cy, cx + radius)],
+            ]
         )
-        normalized_difference = tuple(utils.normalize_vector(list(difference)))
-        offset_vector = tuple(
-            utils.multiply_vector(list(normalized_difference), times=offset)
+        crossings = crossings[
+            np.argsort(np.arctan2(crossings[:, 0] - cy, crossings[:, 1] - cx))
+        ]
+        rows, cols = self.coords_to_dots(
+            crossings[~self._out_of_bounds_mask(crossings)]
         )
 
-        start_yx_coords = tuple(utils.vectors_sum(list(start_yx_coords), offset_vector))
-        stop_yx_coords = tuple(
-            utils.vectors_difference(list(stop_yx_coords), offset_vector)
+        new_dots = (rows != np.roll(rows, 1)) | (cols != np.roll(cols, 1))
+        new_dots[:1] |= not new_dots.any()
+        rows = rows[new_dots]
+        cols = cols[new_dots]
+
+        # The loop is cut open at a dot that isn't at a corner, and closed
+        # again by repeating it at the end, so that every dot that is gets
+        # both its neighbours when thinning.
+        corners = (np.abs(np.roll(rows, 1) - np.roll(rows, -1)) <= 1) & (
+            np.abs(np.roll(cols, 1) - np.roll(cols, -1)) <= 1
+        )
+        start = np.argmin(corners) if len(corners) else 0
+        rows = np.roll(rows, -start)
+        cols = np.roll(cols, -start)
+
+        self._set_dots(
+            *_thin_lines_dots(
+                np.append(rows, rows[:1]),
+                np.append(cols, cols[:1]),
+                np.zeros(len(rows) + 1, dtype=int),
+            )
         )
 
-        dots_row_col_to_draw = OrderedSet()
-        for yx_coords in chain(
-            utils.vector_range(list(start_yx_coords), list(stop_yx_coords), 0.5),
-            [stop_yx_coords],
-        ):
-            if self._out_of_bounds(yx_coords):
-                continue
+    def fill_circle(self, centre_yx_coords: tuple[float, float], radius: float) -> None:
+        """The dots within a circle."""
+        cy, cx = centre_yx_coords
 
-            r, c = closest_dot_row_col = self._closest_dot_row_col(yx_coords)
-
-            dots_row_col_to_draw.add(closest_dot_row_col)
-
-            if (
-                len(
-                    dots_row_col_to_draw
-                    & {
-                        dot_row_col
-                        for dot_row_col in (
-                            (r - 1, c - 1), (r - 1, c    ), (r - 1, c + 1),
-                            (r    , c - 1), (r    , c    ), (r    , c + 1),
-                            (r + 1, c - 1), (r + 1, c    ), (r + 1, c + 1),
-                        )
-                    }
-                )
-                > 2
-            ):
-                dots_row_col_to_draw.pop(index=-2)
+        dots_rows = np.flatnonzero(np.abs(self._dots_ys - cy) <= radius)
+        half_widths = np.sqrt(radius**2 - (self._dots_ys[dots_rows] - cy) ** 2)
+
+        self._fill_spans(dots_rows, cx - half_widths, cx + half_widths)
 
-        for dot_row_col in dots_row_col_to_draw:
-            self.dots[dot_row_col] = True
+    def fill_rect(
+        self,
+        top_left_yx_coords: tuple[float, float],
+        bottom_right_yx_coords: tuple[float, float],
+    ) -> None:
+        """The dots within a rectangle, including its edges."""
+        (top, bottom), (left, right) = np.sort(
+            [top_left_yx_coords, bottom_right_yx_coords], axis=0
+        ).T
+
+        dots_rows = np.arange(
+            np.searchsorted(self._dots_ys, top, side="left"),
+            np.searchsorted(self._dots_ys, bottom, side="right"),
+        )
+
+        self._fill_spans(
+            dots_rows, np.full(len(dots_rows), left), np.full(len(dots_rows), right)
+        )
+
+    def fill_polygon(self, yx_coords: np.ndarray) -> None:
+        """The dots within a polygon, by the even-odd rule."""
+        vertices = np.asarray(yx_coords, dtype=float).reshape(-1, 2)
+        if not len(vertices):
+            return
+
+        y0, x0 = vertices.T
+        y1, x1 = np.roll(vertices, -1, axis=0).T
+
+        dots_rows = np.arange(
+            np.searchsorted(self._dots_ys, y0.min(), side="left"),
+            np.searchsorted(self._dots_ys, y0.max(), side="right"),
+        )
+        ys = self._dots_ys[dots_rows, np.newaxis]
+
+        # Where each dot row crosses each edge, with edges including their
+        # lower end only, so that rows through vertices cross them right.
+        crosses = (np.minimum(y0, y1) <= ys) & (ys < np.maximum(y0, y1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossings_xs = np.where(
+                crosses, x0 + (ys - y0) * (x1 - x0) / (y1 - y0), np.inf
+            )
+        crossings_xs.sort(axis=1)
+
+        # Inside is between the 1st and 2nd crossing, the 3rd and 4th, etc.
+        lefts = crossings_xs[:, 0::2]
+        rights = crossings_xs[:, 1::2][:, : lefts.shape[1]]
+        lefts = lefts[:, : rights.shape[1]]
+        spans = np.isfinite(rights)
+
+        self._fill_spans(
+            np.broadcast_to(dots_rows[:, np.newaxis], spans.shape)[spans],
+            lefts[spans],
+            rights[spans],
+        )
 
     def draw_arrow(
         self,
@@ -243,6 +380,7 @@ class BrailleCanvas:
 
         char_row_col = self._yx_coords_to_char_row_col(yx_coords)
         self._texts_row_col_to_strings[char_row_col].append(text)
+        self._dirty_rows[char_row_col[0]] = True
 
     def bounds_rectangle(self) -> Rectangle:
         """Min/max coordinates of data presented on the plot, in plot coordinates."""
@@ -269,27 +407,264 @@ class BrailleCanvas:
 
         return bottom_right_dot_canvas_yx - top_left_dot_canvas_yx
 
+    @property
+    def cells(self) -> np.ndarray:
+        """The braille pattern of each character, as int_to_braille takes it.
+
+        Changing it in place requires calling mark_dirty.
+        """
+        return self._cells
+
+    @cells.setter
+    def cells(self, cells: np.ndarray) -> None:
+        self._cells = np.asarray(cells, dtype=np.uint8)
+        self.mark_dirty()
+
+    @property
+    def dots(self) -> np.ndarray:
+        """Bool array of the dots drawn, unpacked from cells.
+
+        Item assignments to it, like `canvas.dots[r, c] = True', write through
+        to cells. It's read-only otherwise, so that other changes to it raise
+        rather than being lost: copy it to change it, then assign it back.
+        """
+        bits = np.unpackbits(self.cells[:, :, np.newaxis], axis=2, bitorder="little")
+
+        ret = (
+            bits.reshape(
+                self.char_rows,
+                self.char_columns,
+                _BC.DOTS_ROWS_IN_CHAR,
+                _BC.DOTS_COLS_IN_CHAR,
+            )
+            .transpose(0, 2, 1, 3)
+            .reshape(
+                _BC.DOTS_ROWS_IN_CHAR * self.char_rows,
+                _BC.DOTS_COLS_IN_CHAR * self.char_columns,
+            )
+            .astype(bool)
+            .view(_Dots)
+        )
+        ret.flags.writeable = False
+        ret._canvas = self
+
+        return ret
+
+    @dots.setter
+    def dots(self, dots: np.ndarray) -> None:
+        self.cells = _pack_dots(
+            np.asarray(dots, dtype=bool).reshape(
+                _BC.DOTS_ROWS_IN_CHAR * self.char_rows,
+                _BC.DOTS_COLS_IN_CHAR * self.char_columns,
+            )
+        )
+
+    def render_diff(self, previous: typing.Optional[str]) -> str:
+        """Terminal output turning the previous str(canvas) into the current one.
+
+        See frame_differ.render_diff.
+        """
+        return frame_differ.render_diff(previous, str(self))
+
+    def mark_dirty(self, char_rows: typing.Optional[np.ndarray] = None) -> None:
+        """Make __str__ render these rows of characters again, or all of them."""
+        if char_rows is None:
+            self._dirty_rows[:] = True
+        else:
+            self._dirty_rows[char_rows] = True
+
     def __str__(self) -> str:
-        braille_array_string = np_array_to_braille(self.dots)
-        char_array = string_to_char_array(braille_array_string)
+        # Rows without any columns stay empty strings.
+        dirty_rows = np.flatnonzero(self._dirty_rows)
+        if not len(dirty_rows) or not self.char_columns:
+            return "\n".join(self._rows_strings)
+
+        # Each row's code points, viewed as one string. Indexing _cells directly
+        # picks just the dirty rows, with their columns in order.
+        code_points = _BRAILLE_CODE_POINTS[
+            self._cells[
+                np.ix_(dirty_rows, self._cells_columns(np.arange(self.char_columns)))
+            ]
+        ]
+        dirty_rows_indices = {y: i for i, y in enumerate(dirty_rows.tolist())}
 
         for y, x in self._texts_row_col_to_strings:
+            if y not in dirty_rows_indices:
+                continue
+
             for text in self._texts_row_col_to_strings[y, x]:
                 annotation_length = min(
                     len(text),
                     self.char_columns - x,
                 )
-                char_array[y, x : x + annotation_length] = list(
-                    text[:annotation_length]
-                )
+                code_points[dirty_rows_indices[y], x : x + annotation_length] = [
+                    ord(char) for char in text[:annotation_length]
+                ]
+
+        for y, row_string in zip(
+            dirty_rows_indices, code_points.view(f"U{self.char_columns}").ravel()
+        ):
+            self._rows_strings[y] = str(row_string)
+        self._dirty_rows[:] = False
+
+        return "\n".join(self._rows_strings)
+
+    def _set_dots(self, dots_rows: np.ndarray, dots_cols: np.ndarray) -> None:
+        char_rows = dots_rows // _BC.DOTS_ROWS_IN_CHAR
+
+        np.bitwise_or.at(
+            self._cells,
+            (char_rows, self._cells_columns(dots_cols // _BC.DOTS_COLS_IN_CHAR)),
+            _dot_bit(dots_rows, dots_cols),
+        )
+        self._dirty_rows[char_rows] = True
+
+    def _write_dots(
+        self, dots_rows: np.ndarray, dots_cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """Set or clear each dot, depending on its value."""
+        char_rows = dots_rows // _BC.DOTS_ROWS_IN_CHAR
+        char_cols = self._cells_columns(dots_cols // _BC.DOTS_COLS_IN_CHAR)
+        bits = _dot_bit(dots_rows, dots_cols).astype(np.uint8)
+
+        np.bitwise_and.at(self._cells, (char_rows, char_cols), ~bits)
+        np.bitwise_or.at(
+            self._cells, (char_rows[values], char_cols[values]), bits[values]
+        )
+        self._dirty_rows[char_rows] = True
+
+    def _cells_columns(self, char_cols: np.ndarray) -> np.ndarray:
+        """Where columns of characters are in _cells."""
+        return char_cols
+
+    def _fill_spans(
+        self, dots_rows: np.ndarray, lefts: np.ndarray, rights: np.ndarray
+    ) -> None:
+        """Sets the dots of each dot row from left to right x coordinates."""
+        if not len(dots_rows):
+            return
+
+        starts = np.searchsorted(self._dots_xs, lefts, side="left")
+        stops = np.searchsorted(self._dots_xs, rights, side="right")
+
+        # Only the rows of characters with spans, each span as a +1 at its
+        # start and a -1 past its end, summed along the rows.
+        first_char_row = dots_rows.min() // _BC.DOTS_ROWS_IN_CHAR
+        last_char_row = dots_rows.max() // _BC.DOTS_ROWS_IN_CHAR
+        dots_rows = dots_rows - first_char_row * _BC.DOTS_ROWS_IN_CHAR
+
+        changes = np.zeros(
+            (
+                (last_char_row - first_char_row + 1) * _BC.DOTS_ROWS_IN_CHAR,
+                len(self._dots_xs) + 1,
+            ),
+            dtype=np.int32,
+        )
+        np.add.at(changes, (dots_rows, starts), 1)
+        np.add.at(changes, (dots_rows, np.maximum(starts, stops)), -1)
+
+        cells = _pack_dots(np.cumsum(changes[:, :-1], axis=1) > 0)
+        char_rows = slice(first_char_row, last_char_row + 1)
+        columns = self._cells_columns(np.arange(self.char_columns))
+
+        self._cells[char_rows, columns] |= cells
+        self._dirty_rows[char_rows] |= cells.any(axis=1)
+
+    def coords_to_dots(self, yx_coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and columns of the dots closest to (y, x) rows of an array.
+
+        Coordinates out of bounds map to the closest dots on the edge.
+        """
+        yx_coords = np.asarray(yx_coords, dtype=float).reshape(-1, 2)
+
+        start_y, start_x = _BC.CANVAS_ZERO_YX_COORDS
+        canvas_y = yx_coords[:, 0] + start_y
+        canvas_x = yx_coords[:, 1] + start_x
+
+        acrc_y, acrc_x = _BC.ALIGNED_CHAR_RECTANGLE_CORNER
+        char_row = np.clip(
+            ((canvas_y + acrc_y) / _BC.CHAR_HEIGHT).astype(int), 0, self.char_rows - 1
+        )
+        char_col = np.clip(
+            ((canvas_x + acrc_x) / _BC.CHAR_WIDTH).astype(int),
+            0,
+            self.char_columns - 1,
+        )
+
+        char_y = canvas_y - char_row * _BC.CHAR_HEIGHT
+        char_x = canvas_x - char_col * _BC.CHAR_WIDTH
 
-        return char_array_to_string(char_array)
+        # The dots form a grid, so the closest one is in the closest dot row
+        # and the closest dot column.
+        return (
+            char_row * _BC.DOTS_ROWS_IN_CHAR
+            + np.searchsorted(_BC.CHAR_DOTS_ROWS_BOUNDARIES, char_y),
+            char_col * _BC.DOTS_COLS_IN_CHAR
+            + np.searchsorted(_BC.CHAR_DOTS_COLS_BOUNDARIES, char_x),
+        )
 
     def _out_of_bounds(self, yx_coords: tuple[int, int]) -> bool:
         y, x = yx_coords
-        bounds_y, bounds_x = self.bounds()
+        bounds_y, bounds_x = self._bounds
         return (not 0.0 <= y <= bounds_y) or (not 0.0 <= x <= bounds_x)
 
+    def _out_of_bounds_mask(self, yx_coords: np.ndarray) -> np.ndarray:
+        bounds_y, bounds_x = self._bounds
+        return (
+            ~((0.0 <= yx_coords[:, 0]) & (yx_coords[:, 0] <= bounds_y))
+            | ~((0.0 <= yx_coords[:, 1]) & (yx_coords[:, 1] <= bounds_x))
+        )
+
+    @staticmethod
+    def _lines_samples(
+        start_yx_coords: np.ndarray, stop_yx_coords: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """The points draw_line samples on each line, and their lines' indices.
+
+        For every line, those are the points `utils.vector_range(start, stop,
+        LINE_STEP)' yields, then stop, computed at once for all the lines.
+        """
+        starts = start_yx_coords
+        stops = stop_yx_coords
+        differences = stops - starts
+        lengths = np.hypot(*differences.T)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            steps = differences / lengths[:, np.newaxis] * _BC.LINE_STEP
+
+        # Lines shorter than a step only get their stop. vector_range stops once
+        # it gets to stop (math.isclose with its default tolerances) or past
+        # it, which only the last few points can do.
+        numbers_of_points = np.zeros(len(starts), dtype=int)
+        proper = ~_almost_equal(starts, stops) & (
+            lengths >= np.hypot(*(stops - starts - steps).T)
+        )
+        numbers_of_points[proper] = (lengths[proper] / _BC.LINE_STEP).astype(int) + 2
+        for back in range(3, 0, -1):
+            k = np.maximum(numbers_of_points - back, 0)
+            points = starts + k[:, np.newaxis] * steps
+            stopped = proper & (
+                np.any(
+                    np.sign(differences - k[:, np.newaxis] * steps)
+                    != np.sign(differences),
+                    axis=1,
+                )
+                | _almost_equal(points, stops)
+            )
+            numbers_of_points[stopped] = k[stopped]
+            proper &= ~stopped
+
+        # Each line's points, then its stop.
+        line_indices = np.repeat(np.arange(len(starts)), numbers_of_points + 1)
+        line_starts = np.cumsum(numbers_of_points + 1) - (numbers_of_points + 1)
+        k = np.arange(len(line_indices)) - line_starts[line_indices]
+
+        samples = starts[line_indices] + k[:, np.newaxis] * steps[line_indices]
+        is_stop = k == numbers_of_points[line_indices]
+        samples[is_stop] = stops[line_indices[is_stop]]
+
+        return samples, line_indices
+
     def _yx_coords_to_char_row_col(self, yx_coords: tuple[int, int]) -> tuple[int, int]:
         y, x = yx_coords
 
@@ -313,51 +688,25 @@ class BrailleCanvas:
         return char_row_col
 
     def _closest_dot_row_col(self, yx_coords: tuple[int, int]) -> tuple[int, int]:
+        """coords_to_dots for a single point, without NumPy's overhead."""
         y, x = yx_coords
 
         start_y, start_x = _BC.CANVAS_ZERO_YX_COORDS
         canvas_y = y + start_y
         canvas_x = x + start_x
 
-        acrc_y, acrc_x = _BC.ALIGNED_CHAR_RECTANGLE_CORNER
-        aligned_canvas_y = canvas_y + acrc_y
-        aligned_canvas_x = canvas_x + acrc_x
-
-        char_row = int(aligned_canvas_y / _BC.CHAR_HEIGHT)
-        char_row = max(char_row, 0)
-        char_row = min(char_row, self.char_rows - 1)
-
-        char_col = int(aligned_canvas_x / _BC.CHAR_WIDTH)
-        char_col = max(char_col, 0)
-        char_col = min(char_col, self.char_columns - 1)
+        char_row, char_col = self._yx_coords_to_char_row_col(yx_coords)
 
         char_y = canvas_y - char_row * _BC.CHAR_HEIGHT
         char_x = canvas_x - char_col * _BC.CHAR_WIDTH
-        char_yx = (char_y, char_x)
-
-        all_char_dot_row_col_indices = [
-            (row, col)
-            for row in range(_BC.DOTS_ROWS_IN_CHAR)
-            for col in range(_BC.DOTS_COLS_IN_CHAR)
-        ]
-
-        char_dot_row_col = min(
-            all_char_dot_row_col_indices,
-            key=lambda char_dot_row_col: math.dist(
-                char_yx,
-                _BC.CHAR_DOTS_COORDS[*char_dot_row_col],
-            ),
-        )
 
-        dot_row_col_character_offset = np.array(
-            [
-                char_row * _BC.DOTS_ROWS_IN_CHAR,
-                char_col * _BC.DOTS_COLS_IN_CHAR,
-            ]
+        return (
+            char_row * _BC.DOTS_ROWS_IN_CHAR
+            + bisect.bisect_left(_CHAR_DOTS_ROWS_BOUNDARIES, char_y),
+            char_col * _BC.DOTS_COLS_IN_CHAR
+            + bisect.bisect_left(_CHAR_DOTS_COLS_BOUNDARIES, char_x),
         )
 
-        return tuple(char_dot_row_col + dot_row_col_character_offset)
-
     def _dot_row_col_to_yx_coords(
         self, dot_row_col: tuple[int, int]
     ) -> tuple[int, int]:
@@ -384,6 +733,118 @@ class BrailleCanvas:
 _BC = BrailleCanvas
 
 
+class _Dots(np.ndarray):
+    """BrailleCanvas.dots, writing item assignments through to its canvas.
+
+    Views of it are read-only like it, copies are plain writable arrays.
+    """
+
+    _canvas: typing.Optional[BrailleCanvas] = None
+
+    def __array_finalize__(self, obj: typing.Optional[np.ndarray]) -> None:
+        self._canvas = None
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        if self._canvas is None:
+            super().__setitem__(key, value)
+            return
+
+        written = np.zeros(self.shape, dtype=bool)
+        written[key] = True
+
+        self.flags.writeable = True
+        try:
+            super().__setitem__(key, value)
+        finally:
+            self.flags.writeable = False
+
+        self._canvas._write_dots(
+            *np.nonzero(written), self.view(np.ndarray)[written]
+        )
+
+
+_BRAILLE_CODE_POINTS = np.array(
+    [ord(int_to_braille(n)) for n in range(256)], dtype=np.uint32
+)
+_CHAR_DOTS_ROWS_BOUNDARIES = _BC.CHAR_DOTS_ROWS_BOUNDARIES.tolist()
+_CHAR_DOTS_COLS_BOUNDARIES = _BC.CHAR_DOTS_COLS_BOUNDARIES.tolist()
+
+
+def _pack_dots(dots: np.ndarray) -> np.ndarray:
+    """The braille patterns of the characters of a bool array of dots."""
+    char_rows = dots.shape[0] // _BC.DOTS_ROWS_IN_CHAR
+    char_columns = dots.shape[1] // _BC.DOTS_COLS_IN_CHAR
+    bits = (
+        dots.reshape(
+            char_rows, _BC.DOTS_ROWS_IN_CHAR, char_columns, _BC.DOTS_COLS_IN_CHAR
+        )
+        .transpose(0, 2, 1, 3)
+        .reshape(char_rows, char_columns, -1)
+    )
+
+    return np.packbits(bits, axis=2, bitorder="little")[:, :, 0]
+
+
+def _dot_bit(dots_rows: np.ndarray, dots_cols: np.ndarray) -> np.ndarray:
+    """The bit of the dot in its character's braille pattern."""
+    return 1 << (
+        dots_rows % _BC.DOTS_ROWS_IN_CHAR * _BC.DOTS_COLS_IN_CHAR
+        + dots_cols % _BC.DOTS_COLS_IN_CHAR
+    )
+
+
+def _jiggle(yx_coords: np.ndarray) -> np.ndarray:
+    """`utils.jiggle_vector' for every row, drawing from `random' like it."""
+    rng = np.random.default_rng(random.getrandbits(64))
+
+    return yx_coords + EPSILON * rng.uniform(-1, 1, size=yx_coords.shape)
+
+
+def _almost_equal(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """`utils.are_vectors_almost_equal' for every pair of rows."""
+    return np.all(
+        np.abs(u - v)
+        <= np.maximum(1e-9 * np.maximum(np.abs(u), np.abs(v)), 1e-9),
+        axis=1,
+    )
+
+
+def _thin_lines_dots(
+    dots_rows: np.ndarray, dots_cols: np.ndarray, line_indices: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rows and columns of the dots to draw for lines sampled at these dots.
+
+    Whenever the 3x3 neighbourhood of a newly sampled dot holds more than 2
+    dots drawn for its line, the one drawn before it is dropped, so that lines
+    stay one dot thick.
+    """
+    new_dots = np.flatnonzero(
+        (np.diff(dots_rows, prepend=-1) != 0)
+        | (np.diff(dots_cols, prepend=-1) != 0)
+        | (np.diff(line_indices, prepend=-1) != 0)
+    )
+    rows = dots_rows[new_dots]
+    cols = dots_cols[new_dots]
+    line_indices = line_indices[new_dots]
+
+    # A line's dots are monotonic in both coordinates and at most one dot
+    # apart, so a dot gets dropped iff its neighbours are adjacent, unless the
+    # dot before it was dropped already. That alternates along every run of
+    # such dots, starting with a drop.
+    corners = np.zeros(len(rows), dtype=bool)
+    corners[1:-1] = (
+        (np.abs(rows[2:] - rows[:-2]) <= 1)
+        & (np.abs(cols[2:] - cols[:-2]) <= 1)
+        & (line_indices[2:] == line_indices[:-2])
+    )
+    indices = np.arange(len(rows))
+    run_starts = corners & ~np.concatenate([[False], corners[:-1]])
+    run_start_indices = np.maximum.accumulate(np.where(run_starts, indices, 0))
+    dropped = corners & ((indices - run_start_indices) % 2 == 0)
+
+    return rows[~dropped], cols[~dropped]
+
+
 def rotate_vector_clockwise(v: tuple[int, int], radians: float) -> tuple[int, int]:
     z = (v[1] + 1j * v[0]) * (1j ** (4 / (2 * math.pi) * radians))
 
@@ -394,3 +855,65 @@ def rotate_vector_counterclockwise(
     v: tuple[int, int], radians: float
 ) -> tuple[int, int]:
     return rotate_vector_clockwise(v, -radians)
+
+
+class ScrollingBrailleCanvas(BrailleCanvas):
+    """BrailleCanvas scrolling left by whole characters, for streaming plots.
+
+    Its cells are a ring buffer of columns with a moving origin, so scroll
+    only clears the columns scrolled in, and its cost doesn't depend on the
+    width. Only the newest data then needs drawing, at the right edge.
+    Texts scroll along, and are dropped once their start scrolls out.
+    """
+
+    def __init__(self, char_rows: int, char_columns: int) -> None:
+        super().__init__(char_rows, char_columns)
+
+        # Where the leftmost column of characters is in _cells.
+        self._origin = 0
+
+    @property
+    def cells(self) -> np.ndarray:
+        """The braille pattern of each character, as int_to_braille takes it.
+
+        Unlike BrailleCanvas.cells, it's a read-only copy: copy it again to
+        change it, then assign it back to cells.
+        """
+        ret = np.roll(self._cells, -self._origin, axis=1)
+        ret.flags.writeable = False
+
+        return ret
+
+    @cells.setter
+    def cells(self, cells: np.ndarray) -> None:
+        self._origin = 0
+        BrailleCanvas.cells.fset(self, np.array(cells, dtype=np.uint8))
+
+    def scroll(self, char_columns: int = 1) -> None:
+        """Move everything left by char_columns, with blank ones coming in.
+
+        Every row's content moves, so every row is rendered again by the next
+        str(), reading _cells in place rather than rolling them into a copy.
+        """
+        if char_columns < 0:
+            raise ValueError(
+                f"Can't scroll by a negative number of columns. Got `{char_columns}'."
+            )
+
+        char_columns = min(char_columns, self.char_columns)
+        if not char_columns:
+            return
+
+        self._cells[:, self._cells_columns(np.arange(char_columns))] = 0
+        self._origin = (self._origin + char_columns) % self.char_columns
+
+        texts_row_col_to_strings = self._texts_row_col_to_strings
+        self._texts_row_col_to_strings = defaultdict(list)
+        for (y, x), texts in texts_row_col_to_strings.items():
+            if x >= char_columns:
+                self._texts_row_col_to_strings[y, x - char_columns] = texts
+
+        self.mark_dirty()
+
+    def _cells_columns(self, char_cols: np.ndarray) -> np.ndarray:
+        return (char_cols + self._origin) % self.char_columns
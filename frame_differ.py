@@ -0,0 +1,129 @@
+import typing
+
+import numpy as np
+
+
+# ANSI escape codes, with 1-based row;column coordinates.
+MOVE_CURSOR = "\x1b[{row};{col}H"
+MOVE_CURSOR_TO_ORIGIN = "\x1b[H"
+CLEAR_TO_END_OF_LINE = "\x1b[K"
+CLEAR_TO_END_OF_SCREEN = "\x1b[J"
+
+
+class FrameDiffer:
+    """Terminal output turning the last frame emitted into the next one.
+
+    Frames are strings of lines drawn from the top-left corner of the terminal,
+    with each character taking one column, like BrailleCanvas renders.
+    """
+
+    def __init__(self, full_repaint_fallback: bool = True) -> None:
+        self.full_repaint_fallback = full_repaint_fallback
+        self._previous: typing.Optional[str] = None
+
+    def diff(self, frame: str) -> str:
+        ret = render_diff(
+            self._previous, frame, full_repaint_fallback=self.full_repaint_fallback
+        )
+        self._previous = frame
+
+        return ret
+
+    def reset(self) -> None:
+        """Make the next frame a full repaint, e.g. after the terminal was cleared."""
+        self._previous = None
+
+
+def render_diff(
+    previous: typing.Optional[str], frame: str, full_repaint_fallback: bool = True
+) -> str:
+    """Cursor moves and changed runs of characters turning previous into frame.
+
+    Without previous, or with full_repaint_fallback if that would be longer in
+    UTF-8, it's a full repaint instead.
+    """
+    if previous is None:
+        return full_repaint(frame)
+
+    previous_lines = previous.split("\n")
+    lines = frame.split("\n")
+
+    ret = []
+    for row, line in enumerate(lines):
+        previous_line = previous_lines[row] if row < len(previous_lines) else ""
+        if line != previous_line:
+            ret += _line_diff(row, previous_line, line)
+
+    if len(previous_lines) > len(lines):
+        ret.append(MOVE_CURSOR.format(row=len(lines) + 1, col=1))
+        ret.append(CLEAR_TO_END_OF_SCREEN)
+
+    ret = "".join(ret)
+
+    if full_repaint_fallback and len(ret.encode()) > len(
+        (full := full_repaint(frame)).encode()
+    ):
+        return full
+
+    return ret
+
+
+def full_repaint(frame: str) -> str:
+    return (
+        MOVE_CURSOR_TO_ORIGIN
+        + f"{CLEAR_TO_END_OF_LINE}\r\n".join(frame.split("\n"))
+        + CLEAR_TO_END_OF_SCREEN
+    )
+
+
+def _line_diff(row: int, previous_line: str, line: str) -> list[str]:
+    previous_code_points = _code_points(previous_line)
+    code_points = _code_points(line)
+
+    common_length = min(len(previous_line), len(line))
+    changed = np.concatenate(
+        [
+            np.flatnonzero(
+                previous_code_points[:common_length] != code_points[:common_length]
+            ),
+            np.arange(common_length, len(line)),
+        ]
+    )
+
+    # Changes closer than a cursor move are written together with whatever is
+    # between them, each character taking 1 to 4 bytes in UTF-8.
+    utf8_offsets = np.concatenate(
+        [
+            [0],
+            np.cumsum(
+                1
+                + (code_points >= 0x80)
+                + (code_points >= 0x800)
+                + (code_points >= 0x10000)
+            ),
+        ]
+    )
+    gaps_bytes = utf8_offsets[changed[1:]] - utf8_offsets[changed[:-1] + 1]
+    moves_bytes = len(MOVE_CURSOR.format(row=row + 1, col="")) + (
+        np.log10(changed[1:] + 1).astype(int) + 1
+    )
+    splits = gaps_bytes > moves_bytes
+
+    runs_starts = np.concatenate([changed[:1], changed[1:][splits]]).tolist()
+    runs_stops = np.concatenate([changed[:-1][splits], changed[-1:]]) + 1
+
+    ret = []
+    for start, stop in zip(runs_starts, runs_stops.tolist()):
+        ret.append(MOVE_CURSOR.format(row=row + 1, col=start + 1))
+        ret.append(line[start:stop])
+
+    if len(line) < len(previous_line):
+        if not len(runs_stops) or runs_stops[-1] != len(line):
+            ret.append(MOVE_CURSOR.format(row=row + 1, col=len(line) + 1))
+        ret.append(CLEAR_TO_END_OF_LINE)
+
+    return ret
+
+
+def _code_points(line: str) -> np.ndarray:
+    return np.frombuffer(line.encode("utf-32-le"), dtype="<u4")
@@ -16,6 +16,7 @@ import contextlib
 from algutils.utils import *
 from algutils.np_array_to_braille import np_array_to_braille
 from algutils.braille_canvas import BrailleCanvas, Point, Rectangle
+from algutils.frame_differ import FrameDiffer
 
 
 def map_coords(coord: Point, src: Rectangle, dst: Rectangle) -> Point:
@@ -47,9 +48,6 @@ class Escapes:
     HIDE_CURSOR = b"\x1b[?25l"
     SHOW_CURSOR = b"\x1b[?25h"
 
-    # 0;0 are 0-based line;column coordinates, with top-left being 0;0.
-    MOVE_CURSOR_TO_ORIGIN = b"\x1b[0;0H"
-
 
 def ansi_scoped_enable(enable: bytes, disable: bytes):
     if os.isatty(sys.stdout.fileno()):
@@ -120,8 +118,7 @@ class Plot:
 
         points = [convert(Point(x=idx, y=val)) for idx, val in enumerate(series)]
 
-        for u, v in zip(points[:-1], points[1:]):
-            self.canvas.draw_line(u, v)
+        self.canvas.draw_polyline(points)
 
     @property
     def x_axis_margin(self) -> int:
@@ -195,14 +192,16 @@ def main():
     try:
         with hide_cursor(), use_alternate_screen():
             series = []
+            # Only the parts of the screen that changed get written.
+            frame_differ = FrameDiffer()
             for line in sys.stdin:
                 value = float(line)
                 series = (series + [value])[-100:]
                 if os.isatty(sys.stdout.fileno()):
-                    sys.stdout.buffer.write(Escapes.MOVE_CURSOR_TO_ORIGIN)
+                    sys.stdout.write(frame_differ.diff(str(Plot(series))))
                 else:
                     sys.stdout.write("\n")
-                sys.stdout.write(str(Plot(series)))
+                    sys.stdout.write(str(Plot(series)))
                 sys.stdout.flush()
     except KeyboardInterrupt:
         # do clean exit on Ctrl+C
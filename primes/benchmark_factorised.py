@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import factorised
+from algutils.primes import primes
+
+import argparse
+import functools
+import time
+
+
+def _primorial(lim, exponent):
+  ret = factorised.Factorised()
+  for p in primes.sieve(lim):
+    ret *= factorised.Factorised(p)
+
+  return ret**exponent
+
+
+def _factorial(n):
+  # Legendre's formula for the exponent of each prime.
+  ret = factorised.Factorised()
+  for p in primes.sieve(n + 1):
+    e = 0
+    pk = p
+    while pk <= n:
+      e += n // pk
+      pk *= p
+    ret *= factorised.Factorised(p)**e
+
+  return ret
+
+
+def _left_to_right_int(f):
+  # The conversion __int__ did before the product tree.
+  return functools.reduce(
+      lambda a, b: a * b, (p**e for p, e in f.factors.items()), 1)
+
+
+def _time(function, *args):
+  start = time.perf_counter()
+  ret = function(*args)
+  return time.perf_counter() - start, ret
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description="Compare Factorised.__int__ with left to right products.")
+  parser.add_argument("--primorial-lim", type=int, default=1000)
+  parser.add_argument("--primorial-exponent", type=int, default=10**4)
+  parser.add_argument("--factorial", type=int, default=10**5)
+  parser.add_argument("--mod", type=int, default=10**9 + 7)
+  args = parser.parse_args()
+
+  factorised.CACHE_INTS = False
+
+  cases = [
+      (f"primorial({args.primorial_lim})**{args.primorial_exponent}",
+       _primorial(args.primorial_lim, args.primorial_exponent)),
+      (f"factorial({args.factorial})", _factorial(args.factorial)),
+  ]
+
+  for name, f in cases:
+    left_to_right_seconds, want = _time(_left_to_right_int, f)
+    tree_seconds, got = _time(int, f)
+    mod_seconds, got_mod = _time(f.to_int, args.mod)
+
+    if got != want or got_mod != want % args.mod:
+      raise RuntimeError(f"Product tree disagrees for {name}")
+
+    print(f"{name}:")
+    print(f"  left to right:    {left_to_right_seconds:.3f}s")
+    print(f"  product tree:     {tree_seconds:.3f}s")
+    print(f"  speedup:          {left_to_right_seconds / tree_seconds:.2f}x")
+    print(f"  modulo {args.mod}: {mod_seconds:.6f}s")
+
+
+if __name__ == '__main__':
+  main()
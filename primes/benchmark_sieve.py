@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primes
+
+import argparse
+import os
+import time
+
+
+def _time_sieve(lim, processes):
+  start = time.perf_counter()
+  ps = primes.sieve(lim, compact=True, processes=processes)
+  return time.perf_counter() - start, len(ps)
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description="Compare the serial and the parallel primes.sieve.")
+  parser.add_argument("--lim", type=int, default=10**9)
+  parser.add_argument("--processes", type=int, default=os.cpu_count())
+  args = parser.parse_args()
+
+  serial_seconds, serial_count = _time_sieve(args.lim, processes=1)
+  parallel_seconds, parallel_count = _time_sieve(
+      args.lim, processes=args.processes)
+
+  if serial_count != parallel_count:
+    raise RuntimeError(
+        f"Serial and parallel sieves disagree: {serial_count} != {parallel_count}")
+
+  print(f"lim={args.lim} π(lim)={serial_count}")
+  print(f"serial:              {serial_seconds:.3f}s")
+  print(f"parallel ({args.processes} processes): {parallel_seconds:.3f}s")
+  print(f"speedup:             {serial_seconds / parallel_seconds:.2f}x")
+
+
+if __name__ == '__main__':
+  main()
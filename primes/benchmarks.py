@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import cached_primes
+from algutils.primes import factorisation
+from algutils.primes import factorised
+from algutils.primes import primality
+from algutils.primes import primes
+
+import functools
+import math
+import random
+
+import numpy as np
+
+
+# Benchmarks of the primes package, run with python3 -m algutils.bench primes.
+
+_SIEVE_LIMS = [10**4, 10**5, 10**6, 10**7, 10**8]
+_IS_PRIME_MAGNITUDES = [10**5, 10**9, 10**18, 10**36, 10**100]
+_IS_PRIME_CALLS = 1000
+# Magnitudes is_prime_array runs over in uint64, below 2**32 and above.
+_IS_PRIME_ARRAY_MAGNITUDES = [10**9, 10**18]
+_IS_PRIME_ARRAY_SIZE = 10**4
+
+
+def benchmarks():
+  """List of (name, function) pairs for algutils.bench."""
+  rng = random.Random(0)
+  ret = []
+
+  for lim in _SIEVE_LIMS:
+    ret.append((f"sieve/1e{_log10(lim)}",
+                functools.partial(primes.sieve, lim, compact=True)))
+
+  for magnitude in _IS_PRIME_MAGNITUDES:
+    ns = [rng.randrange(magnitude, 2 * magnitude) | 1
+          for _ in range(_IS_PRIME_CALLS)]
+    ret.append((f"is_prime/1e{_log10(magnitude)}",
+                functools.partial(_is_prime_all, ns)))
+
+    if magnitude in _IS_PRIME_ARRAY_MAGNITUDES:
+      ns = [rng.randrange(magnitude, 2 * magnitude) | 1
+            for _ in range(_IS_PRIME_ARRAY_SIZE)]
+      ret.append((f"is_prime_array/1e{_log10(magnitude)}",
+                  functools.partial(primality.is_prime_array,
+                                    np.array(ns, dtype=np.uint64))))
+
+  smooth = [math.prod(rng.choices(primes.sieve(1000), k=20)) for _ in range(100)]
+  ret.append(("factorise/smooth", functools.partial(_factorise_all, smooth)))
+
+  for digits in [12, 20, 30, 40]:
+    n = _random_prime(rng, digits // 2) * _random_prime(rng, digits - digits // 2)
+    ret.append((f"factorise/semiprime{digits}",
+                functools.partial(_factorise_all, [n])))
+
+  fs = [factorised.Factorised(n) for n in range(1, 2000)]
+  ret.append(("factorised/mul", functools.partial(_product, fs)))
+  ret.append(("factorised/div", functools.partial(_quotients, fs)))
+  ret.append(("factorised/pow", functools.partial(_powers, fs)))
+  ret.append(("factorised/int", functools.partial(_to_int, _product(fs))))
+
+  return ret
+
+
+def _is_prime_all(ns):
+  # The small ones come from the cache, grown beforehand.
+  cached_primes.get_primes_list(min_lim=2 * _IS_PRIME_MAGNITUDES[0])
+  return [cached_primes.is_prime(n) for n in ns]
+
+
+def _factorise_all(ns):
+  return [factorisation.factorise(n) for n in ns]
+
+
+def _product(fs):
+  return functools.reduce(lambda a, b: a * b, fs)
+
+
+def _quotients(fs):
+  return [a / b for a, b in zip(fs, reversed(fs))]
+
+
+def _powers(fs):
+  return [f**97 for f in fs]
+
+
+def _to_int(f):
+  factorised.CACHE_INTS, cache_ints = False, factorised.CACHE_INTS
+  try:
+    return int(f)
+  finally:
+    factorised.CACHE_INTS = cache_ints
+
+
+def _random_prime(rng, digits):
+  n = rng.randrange(10**(digits - 1), 10**digits)
+  while not primality.is_prime(n):
+    n += 1
+
+  return n
+
+
+def _log10(n):
+  return round(math.log10(n))
@@ -1,41 +1,207 @@
 #!/usr/bin/env python3
 
 
+from algutils.primes import primality
+from algutils.primes import prime_bitset
+from algutils.primes import prime_table
 from algutils.primes import primes
 
+import collections
+import threading
 
-_PRIMES = [2, 3]
-_SET_PRIMES = set(_PRIMES)
+import numpy as np
 
 
-def _precompute_primes(min_lim):
-  global _PRIMES, _SET_PRIMES
+# Everything known about the numbers below lim. Replaced as a whole when the
+# cache grows, so that readers never need the lock: they see either the old
+# state or the new one. primes is only ever appended to. Both primes and
+# bitset are None when reading from a table file, which answers instead.
+_State = collections.namedtuple("_State", ["lim", "primes", "bitset"])
 
-  if _PRIMES[-1] < min_lim - 1:
-    _PRIMES = primes.sieve(min_lim)
-    _SET_PRIMES = set(_PRIMES)
+CacheStats = collections.namedtuple(
+    "CacheStats", ["hits", "misses", "growths", "lim"])
+
+def _initial_state():
+  return _State(
+      lim=4, primes=[2, 3], bitset=prime_bitset.PrimeBitset([2, 3], 4))
+
+def _table_file_state(table_file):
+  return _State(lim=table_file.lim, primes=None, bitset=None)
+
+_STATE = _initial_state()
+# Serialises growth, and with it _MISSES and _GROWTHS. Reads go through
+# _STATE without taking it.
+_LOCK = threading.Lock()
+# Serialises _HITS only, so that hits never wait for a growth in progress.
+_HITS_LOCK = threading.Lock()
+
+# Requests the cache already covered, requests it didn't, and times it grew.
+# A miss doesn't grow the cache if another thread grew it meanwhile.
+_HITS = 0
+_MISSES = 0
+_GROWTHS = 0
+
+# (lim, frozenset) of the primes below lim, built on demand for
+# get_primes_set.
+_PRIMES_SET = None
+# Opt-in prime_table.PrimeTableFile the cache is read from, see
+# use_table_file.
+_TABLE_FILE = None
+# (lim, list) of the primes below lim read from _TABLE_FILE, built only once
+# get_primes_list asks for them, and only ever appended to.
+_TABLE_FILE_PRIMES = (0, [])
+
+
+def use_table_file(path):
+  """Reads the cache from the prime table file at path, or stops if None.
+
+  The file is built once, then shared by every process using it through
+  mmap, and grown in place when a larger limit is requested. Primes are
+  looked up in its pages rather than copied out of them, but for
+  get_primes_list, which has to build its list.
+  """
+  global _STATE, _PRIMES_SET, _TABLE_FILE, _TABLE_FILE_PRIMES
+
+  with _LOCK:
+    if _TABLE_FILE is not None:
+      _TABLE_FILE.close()
+
+    _TABLE_FILE = None if path is None else prime_table.PrimeTableFile(path)
+
+    _STATE = (_initial_state() if _TABLE_FILE is None
+              else _table_file_state(_TABLE_FILE))
+    _PRIMES_SET = None
+    _TABLE_FILE_PRIMES = (0, [])
+
+def cache_stats():
+  return CacheStats(
+      hits=_HITS, misses=_MISSES, growths=_GROWTHS, lim=_STATE.lim)
+
+def _precompute_primes(min_lim, processes=1):
+  # The cache grows at least twofold, sieving only the numbers it didn't
+  # cover yet, so a sequence of increasing requests costs linear time.
+  global _STATE, _HITS, _MISSES, _GROWTHS
+
+  state = _STATE
+  if state.lim >= min_lim:
+    with _HITS_LOCK:
+      _HITS += 1
+    return state
+
+  with _LOCK:
+    _MISSES += 1
+
+    state = _STATE
+    if state.lim >= min_lim:
+      return state
+
+    lim = max(min_lim, 2 * state.lim)
+
+    if _TABLE_FILE is None:
+      new_primes = primes.sieve(lim, processes=processes, start=state.lim)
+
+      # Appending keeps get_primes_list results handed out earlier valid, as
+      # their prefix is unchanged.
+      state.primes.extend(new_primes)
+      _STATE = _State(
+          lim=lim,
+          primes=state.primes,
+          bitset=state.bitset.extended(new_primes, lim),
+      )
+    else:
+      _TABLE_FILE.ensure(lim)
+      _STATE = _table_file_state(_TABLE_FILE)
+    _GROWTHS += 1
+
+    return _STATE
 
 def is_prime(n):
-  lim = int(n**.5) + 1
-  _precompute_primes(min_lim=lim)
+  # Answered from the cache when it covers n, without ever growing it.
+  table_file = _TABLE_FILE
+  if table_file is not None and 0 <= n < table_file.lim:
+    return table_file.is_prime(n)
+
+  state = _STATE
+  if n < state.lim and state.bitset is not None:
+    return n in state.bitset
+
+  return primality.is_prime(n)
+
+def is_prime_array(ns):
+  """Boolean ndarray of is_prime over each element of an integer array.
+
+  Values the cache covers are looked up in its bit table all at once, the
+  rest go through primality.is_prime_array. The cache is never grown.
+  """
+  ns = np.asarray(ns)
+
+  # Looked up in the table file when there is one, as the cache then keeps
+  # no bit table of its own.
+  state = _STATE
+  table_file = _TABLE_FILE
+  from_file = table_file is not None
+  lim = table_file.lim if from_file else state.lim
+
+  if ns.dtype == object:
+    cached = np.array(
+        [0 <= n < lim for n in ns.ravel()], dtype=bool).reshape(ns.shape)
+  else:
+    cached = (ns >= 0) & (ns < lim)
+
+  ret = np.zeros(ns.shape, dtype=bool)
+
+  cached_ns = ns[cached].astype(np.int64)
+  if from_file:
+    ret[cached] = prime_table.lookup(table_file.bits, cached_ns)
+  else:
+    ret[cached] = state.bitset.lookup(cached_ns)
+  ret[~cached] = primality.is_prime_array(ns[~cached])
+
+  return ret
+
+def get_primes_list(min_lim, processes=1):
+  """List of the primes below at least min_lim.
+
+  The list is shared with the cache, which may append larger primes to it
+  later: don't modify it.
+  """
+  global _TABLE_FILE_PRIMES
+
+  state = _precompute_primes(min_lim, processes=processes)
+  if state.primes is not None:
+    return state.primes
+
+  # Read from the table file, only as far as asked for.
+  lim, ps = _TABLE_FILE_PRIMES
+  if lim < min_lim:
+    with _LOCK:
+      lim, ps = _TABLE_FILE_PRIMES
+      if lim < min_lim:
+        ps.extend(_TABLE_FILE.primes(state.lim, start=lim).tolist())
+        _TABLE_FILE_PRIMES = (state.lim, ps)
 
-  if n <= _PRIMES[-1]:
-    return n in _SET_PRIMES
+  return ps
 
-  for p in _PRIMES:
-    if p > lim:
-      break
+def get_primes_set(min_lim, compact=False):
+  """Set of the primes below at least min_lim.
 
-    if n % p == 0:
-      return False
+  A frozenset shared with the cache, or a prime_bitset.PrimeBitset taking
+  about a bit per 30/8 numbers when compact is set. With a table file, either
+  way it's a prime_table.PrimeTableSet viewing the file's pages. All are
+  read-only: copy the result into a set to modify it.
+  """
+  global _PRIMES_SET
 
-  return True
+  state = _precompute_primes(min_lim)
+  if state.bitset is None:
+    return _TABLE_FILE.primes_set()
 
-def get_primes_list(min_lim):
-  _precompute_primes(min_lim)
-  return _PRIMES
+  if compact:
+    return state.bitset
 
-def get_primes_set(min_lim):
-  _precompute_primes(min_lim)
-  return _SET_PRIMES
+  primes_set = _PRIMES_SET
+  if primes_set is None or primes_set[0] < min_lim:
+    primes_set = _PRIMES_SET = (
+        state.lim, frozenset(state.primes[:len(state.bitset)]))
 
+  return primes_set[1]
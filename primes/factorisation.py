@@ -1,23 +1,97 @@
 #!/usr/bin/env python3
 
 
-from algutils.primes import cached_primes
+from algutils.primes import primality
+from algutils.primes import primes
+from algutils.primes import siqs
+from algutils.primes import smallest_prime_factors
+
+import collections
+import math
+import random
+import sys
+import threading
+
+import numpy as np
+
+
+_TRIAL_DIVISION_PRIMES = primes.sieve(1000)
+
+# Number of rho steps between gcds in pollard_brent.
+_BATCH_SIZE = 128
+
+# Cofactors with at least this many digits are handed to the quadratic sieve
+# once Pollard-Brent has taken _RHO_MAX_ITERATIONS steps without a factor.
+SIQS_MIN_DIGITS = 25
+SIQS_PROCESSES = 1
+_RHO_MAX_ITERATIONS = 1 << 16
+
+# factorise_many builds the smallest prime factor table up to this bound.
+SMALLEST_PRIME_FACTORS_MAX_LIM = 1 << 25
+
+CacheStats = collections.namedtuple(
+    "CacheStats", ["hits", "misses", "evictions", "entries", "bytes"])
+
+# Opt-in _LRUCache factorise goes through, see use_cache.
+_CACHE = None
+
+
+def use_cache(max_entries=None, max_bytes=None):
+  """Makes factorise memoise its results in a new LRU cache.
+
+  The cache holds at most max_entries results, and at most about max_bytes
+  bytes of them, evicting the least recently used ones first. It is shared
+  by all threads. factorise returns copies of the cached results, so callers
+  can't corrupt them. With both limits None, factorise stops memoising
+  instead.
+  """
+  global _CACHE
+
+  if max_entries is None and max_bytes is None:
+    _CACHE = None
+  else:
+    _CACHE = _LRUCache(max_entries, max_bytes)
+
+
+def cache_stats():
+  """CacheStats of the cache set by use_cache, None if there is none."""
+  cache = _CACHE
+  return None if cache is None else cache.stats()
 
 
 def factorise(n):
+  """Dict from each prime factor of n to its exponent, in increasing order.
+
+  A new dict on every call, even when it comes from the cache, see use_cache.
+  """
   if n <= 0:
     raise ValueError("n must be a positive integer")
 
-  ps = cached_primes.get_primes_list(min_lim=int(n**.5) + 1)
+  cache = _CACHE
+  if cache is not None:
+    return dict(cache.get(n, _factorise))
+
+  return _factorise(n)
+
 
+def _factorise(n):
   ret = {}
 
-  for p in ps:
+  if n < smallest_prime_factors.lim():
+    table = smallest_prime_factors.get_table(0)
+    while n > 1:
+      p = int(table[n])
+      n //= p
+      ret[p] = ret.get(p, 0) + 1
+    return ret
+
+  for p in _TRIAL_DIVISION_PRIMES:
     if n == 1:
       break
 
     if p**2 > n:  # n is prime
-      break
+      ret[n] = 1
+      return ret
 
     if n % p == 0:
       n //= p
@@ -27,8 +101,216 @@ def factorise(n):
         v += 1
       ret[p] = v
 
-  if n > 1:  # n is prime
-    ret[n] = 1
+  # Whatever is left has no prime factors below the trial division bound.
+  cofactors = [n] if n > 1 else []
+  large_factors = {}
+
+  while cofactors:
+    m = cofactors.pop()
+
+    if primality.is_prime(m):
+      large_factors[m] = large_factors.get(m, 0) + 1
+      continue
+
+    root, k = _perfect_power(m)
+    if k > 1:
+      # Rho would need about sqrt(root) steps to split a prime power.
+      cofactors += [root] * k
+      continue
+
+    if len(str(m)) < SIQS_MIN_DIGITS:
+      d = pollard_brent(m)
+    else:
+      d = pollard_brent(m, max_iterations=_RHO_MAX_ITERATIONS)
+      if d is None:
+        d = siqs.find_factor(m, processes=SIQS_PROCESSES)
+
+    cofactors += [d, m // d]
+
+  ret.update(sorted(large_factors.items()))
+
+  return ret
+
+
+def factorise_many(ns):
+  """List of factorise(n) for each n in an iterable or array.
+
+  Numbers below SMALLEST_PRIME_FACTORS_MAX_LIM are factorised together by
+  repeated division by their smallest prime factors, looked up in a table
+  built on demand; the rest one by one.
+  """
+  ns = [int(n) for n in ns]
+  if any(n <= 0 for n in ns):
+    raise ValueError("n must be a positive integer")
+
+  small = [i for i, n in enumerate(ns) if n < SMALLEST_PRIME_FACTORS_MAX_LIM]
+  ret = [None] * len(ns)
+
+  if small:
+    small_ns = np.array([ns[i] for i in small], dtype=np.int64)
+    table = smallest_prime_factors.get_table(int(small_ns.max()) + 1)
+
+    for i, factors in zip(small, _factorise_with_table(small_ns, table)):
+      ret[i] = factors
+
+  for i, n in enumerate(ns):
+    if ret[i] is None:
+      ret[i] = factorise(n)
+
+  return ret
+
+
+class _LRUCache(object):
+  # Thread-safe LRU map from n to its factorisation. Values are computed
+  # outside the lock, so a slow factorisation doesn't hold up the others.
+  # They're shared by every get, so callers must copy them before handing
+  # them out.
+
+  def __init__(self, max_entries, max_bytes):
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    self._lock = threading.Lock()
+    self._entries = collections.OrderedDict()  # n -> (factors, bytes)
+    self._bytes = 0
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  def get(self, n, compute):
+    with self._lock:
+      entry = self._entries.get(n)
+      if entry is not None:
+        self._entries.move_to_end(n)
+        self._hits += 1
+        return entry[0]
+
+      self._misses += 1
+
+    factors = compute(n)
+    size = _entry_bytes(n, factors)
+
+    with self._lock:
+      if n not in self._entries:
+        self._entries[n] = (factors, size)
+        self._bytes += size
+        self._evict()
+
+    return factors
+
+  def stats(self):
+    with self._lock:
+      return CacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._evictions,
+          entries=len(self._entries),
+          bytes=self._bytes,
+      )
+
+  def _evict(self):
+    while self._entries and (
+        (self._max_entries is not None
+         and len(self._entries) > self._max_entries)
+        or (self._max_bytes is not None and self._bytes > self._max_bytes)):
+      _, (_, size) = self._entries.popitem(last=False)
+      self._bytes -= size
+      self._evictions += 1
+
+
+def _entry_bytes(n, factors):
+  # Approximate memory held by a cache entry.
+  return (sys.getsizeof(n) + sys.getsizeof(factors)
+          + sum(sys.getsizeof(p) + sys.getsizeof(e)
+                for p, e in factors.items()))
+
+
+def _factorise_with_table(ns, table):
+  # Divides every n by its smallest prime factor at once, until all reach 1.
+  ret = [{} for _ in range(len(ns))]
+  indices = np.arange(len(ns))
+
+  while len(ns):
+    remaining = ns > 1
+    indices = indices[remaining]
+    ns = ns[remaining]
+
+    ps = table[ns]
+    for i, p in zip(indices.tolist(), ps.tolist()):
+      factors = ret[i]
+      factors[p] = factors.get(p, 0) + 1
+
+    ns = ns // ps
 
   return ret
 
+
+def pollard_brent(n, max_iterations=None):
+  """Some non-trivial factor of n, n composite.
+
+  Brent's variant of Pollard's rho, multiplying _BATCH_SIZE differences
+  together between gcds. Returns None if no factor turns up within
+  max_iterations steps.
+  """
+  if n % 2 == 0:
+    return 2
+
+  rng = random.Random(n)
+  iterations = 0
+
+  while True:
+    y = rng.randrange(1, n)
+    c = rng.randrange(1, n)
+    g = q = r = 1
+
+    while g == 1:
+      x = y
+      for _ in range(r):
+        y = (y * y + c) % n
+
+      k = 0
+      while k < r and g == 1:
+        ys = y
+        for _ in range(min(_BATCH_SIZE, r - k)):
+          y = (y * y + c) % n
+          q = q * (x - y) % n
+        g = math.gcd(q, n)
+        k += _BATCH_SIZE
+
+      iterations += 2 * r
+      if g == 1 and max_iterations is not None and iterations >= max_iterations:
+        return None
+
+      r *= 2
+
+    if g == n:
+      # The batch overshot; redo it one step at a time.
+      g = 1
+      while g == 1:
+        ys = (ys * ys + c) % n
+        g = math.gcd(x - ys, n)
+
+    if g != n:
+      return g
+
+
+def _perfect_power(n):
+  # (root, k) with root**k == n and k as large as possible, n > 1.
+  for k in reversed(_TRIAL_DIVISION_PRIMES):
+    if k < n.bit_length():
+      root = _integer_root(n, k)
+      if root**k == n:
+        root, j = _perfect_power(root)
+        return root, j * k
+
+  return n, 1
+
+
+def _integer_root(n, k):
+  # floor(n**(1/k)), by Newton's method from above.
+  x = 1 << -(-n.bit_length() // k)
+
+  while True:
+    y = ((k - 1) * x + n // x**(k - 1)) // k
+    if y >= x:
+      return x
+    x = y
@@ -3,64 +3,214 @@
 
 from algutils.primes import factorisation
 
-import copy
 import functools
+import itertools
+import math
 
-class Factorised(object):
-  def __init__(self, number=1):
-    if number < 1:
-      raise ValueError("Factorised number must be at least 1")
 
-    self.factors = factorisation.factorise(number)
+# Whether to_int keeps its last result, so that converting the same
+# Factorised again is free.
+CACHE_INTS = True
 
-  def __int__(self):
-    product = lambda a, b: a * b
-    return int(functools.reduce(
-        product, (k**v for k, v in self.factors.items()), 1))
 
-  def _normalise(self):
-    zeroes = [k for k, v in self.factors.items() if v == 0]
+@functools.total_ordering
+class Factorised(object):
+  """Positive rational number kept as its prime factorisation.
 
-    for k in zeroes:
-      del self.factors[k]
+  The primes and their non-zero exponents are stored as parallel sorted
+  tuples. Instances are immutable: *, / and ** merge the tuples in linear
+  time into a new Factorised, and the in-place forms rebind the name.
+  """
 
-    return self
+  __slots__ = ("_primes", "_exponents", "_cached_int")
 
-  def __imul__(self, other):
-    for k, v in other.factors.items():
-      self.factors.setdefault(k, 0)
-      self.factors[k] += v
+  def __init__(self, number=1):
+    if number < 1:
+      raise ValueError("Factorised number must be at least 1")
 
-    return self._normalise()
+    factors = factorisation.factorise(number)
+    self._primes = tuple(sorted(factors))
+    self._exponents = tuple(factors[p] for p in self._primes)
+    self._cached_int = None
 
-  def __mul__(self, other):
-    ret = copy.deepcopy(self)
-    ret *= other
+  @classmethod
+  def _new(cls, primes, exponents):
+    ret = cls.__new__(cls)
+    ret._primes = primes
+    ret._exponents = exponents
+    ret._cached_int = None
 
     return ret
 
-  def __itruediv__(self, other):
-    for k, v in other.factors.items():
-      self.factors.setdefault(k, 0)
-      self.factors[k] -= v
+  @property
+  def factors(self):
+    """Dict from each prime to its non-zero exponent, a fresh copy."""
+    return dict(zip(self._primes, self._exponents))
 
-    return self._normalise()
-
-  def __truediv__(self, other):
-    ret = copy.deepcopy(self)
-    ret /= other
+  def __int__(self):
+    return self.to_int()
+
+  def to_int(self, mod=None):
+    """The number rounded down, or modulo mod if given.
+
+    The prime powers are multiplied pairwise in a balanced product tree, so
+    that the big multiplications are between numbers of similar sizes. With
+    mod, negative exponents stand for inverses modulo mod, and a ValueError
+    is raised if they don't exist.
+    """
+    if self._cached_int is not None and self._cached_int[0] == mod:
+      return self._cached_int[1]
+
+    if mod is None:
+      numerator, denominator = self._numerator_denominator()
+      ret = numerator // denominator
+    else:
+      ret = _product(
+          [pow(p, e, mod) for p, e in zip(self._primes, self._exponents)],
+          mod) % mod
+
+    if CACHE_INTS:
+      self._cached_int = (mod, ret)
 
     return ret
 
-  def __ipow__(self, exponent):
-    for k in self.factors.keys():
-      self.factors[k] *= exponent
+  def _numerator_denominator(self):
+    numerator = _product(
+        [p**e for p, e in zip(self._primes, self._exponents) if e > 0])
+    denominator = _product(
+        [p**-e for p, e in zip(self._primes, self._exponents) if e < 0])
+
+    return numerator, denominator
+
+  def _merge(self, other, op):
+    # Factorised with op(a, b) as the exponent of each prime, missing
+    # exponents being 0, in one pass over both sorted tuples.
+    primes = []
+    exponents = []
+    i = j = 0
+    a_primes, a_exponents = self._primes, self._exponents
+    b_primes, b_exponents = other._primes, other._exponents
+
+    while i < len(a_primes) or j < len(b_primes):
+      a_p = a_primes[i] if i < len(a_primes) else None
+      b_p = b_primes[j] if j < len(b_primes) else None
+
+      if b_p is None or (a_p is not None and a_p < b_p):
+        p, e = a_p, op(a_exponents[i], 0)
+        i += 1
+      elif a_p is None or b_p < a_p:
+        p, e = b_p, op(0, b_exponents[j])
+        j += 1
+      else:
+        p, e = a_p, op(a_exponents[i], b_exponents[j])
+        i += 1
+        j += 1
+
+      if e:
+        primes.append(p)
+        exponents.append(e)
+
+    return Factorised._new(tuple(primes), tuple(exponents))
 
-    return self._normalise()
+  def __mul__(self, other):
+    if not isinstance(other, Factorised):
+      return NotImplemented
 
-  def __pow__(self, exponent):
-    ret = copy.deepcopy(self)
-    ret **= exponent
+    return self._merge(other, lambda a, b: a + b)
 
-    return ret
+  def __truediv__(self, other):
+    if not isinstance(other, Factorised):
+      return NotImplemented
 
+    return self._merge(other, lambda a, b: a - b)
+
+  def __pow__(self, exponent):
+    if exponent == 0:
+      return Factorised._new((), ())
+
+    return Factorised._new(
+        self._primes, tuple(e * exponent for e in self._exponents))
+
+  def gcd(self, other):
+    """Greatest common divisor: the smaller exponent of each prime."""
+    return self._merge(other, min)
+
+  def lcm(self, other):
+    """Least common multiple: the larger exponent of each prime."""
+    return self._merge(other, max)
+
+  def divisors(self):
+    """Generator over the divisors of an integer Factorised, as ints.
+
+    Yields them in no particular order, without building the whole list.
+    """
+    self._check_integer()
+
+    powers = [
+        [p**k for k in range(e + 1)]
+        for p, e in zip(self._primes, self._exponents)
+    ]
+    for combination in itertools.product(*powers):
+      yield math.prod(combination)
+
+  def num_divisors(self):
+    self._check_integer()
+    return math.prod(e + 1 for e in self._exponents)
+
+  def totient(self):
+    """Euler's φ of an integer Factorised."""
+    self._check_integer()
+    return math.prod(
+        p**(e - 1) * (p - 1) for p, e in zip(self._primes, self._exponents))
+
+  def _check_integer(self):
+    if any(e < 0 for e in self._exponents):
+      raise ValueError("Factorised number must be an integer")
+
+  def __eq__(self, other):
+    if not isinstance(other, Factorised):
+      return NotImplemented
+
+    return (self._primes == other._primes
+            and self._exponents == other._exponents)
+
+  def __lt__(self, other):
+    if not isinstance(other, Factorised):
+      return NotImplemented
+
+    # Compares the logarithms of self / other's numerator and denominator,
+    # exactly only when they're too close for floats.
+    quotient = self / other
+    log_numerator = log_denominator = 0.0
+    for p, e in zip(quotient._primes, quotient._exponents):
+      if e > 0:
+        log_numerator += e * math.log(p)
+      else:
+        log_denominator -= e * math.log(p)
+
+    if abs(log_numerator - log_denominator) > 1e-9 * (
+        log_numerator + log_denominator):
+      return log_numerator < log_denominator
+
+    numerator, denominator = quotient._numerator_denominator()
+    return numerator < denominator
+
+  def __hash__(self):
+    return hash((self._primes, self._exponents))
+
+  def __repr__(self):
+    return f"Factorised({self.factors})"
+
+
+def _product(values, mod=None):
+  # Product of a list of ints, multiplied pairwise level by level.
+  if not values:
+    return 1
+
+  while len(values) > 1:
+    products = [a * b for a, b in zip(values[::2], values[1::2])]
+    if mod is not None:
+      products = [v % mod for v in products]
+    values = products + values[len(products) * 2:]
+
+  return values[0]
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primes
+
+import math
+
+import numpy as np
+
+
+# Numbers per segment in iter_segments.
+SEGMENT_SIZE = 1 << 18
+
+
+def sieve(lim, prime_power, lo=0, dtype=np.int64, additive=False):
+  """NumPy array of f(n) for n in [lo, lim), f multiplicative.
+
+  f is given by its values on prime powers: prime_power(p, e) takes int64
+  arrays of primes p and exponents e >= 1, and returns f(p**e) for each.
+  With additive set, f(m*n) = f(m) + f(n) for coprime m and n instead of
+  f(m) * f(n). The entry for 0, if any, is 0.
+  """
+  return np.concatenate(
+      [np.empty(0, dtype=dtype)]
+      + [values for _, values in iter_segments(
+          lim, prime_power, lo=lo, dtype=dtype, additive=additive)])
+
+
+def iter_segments(lim, prime_power, lo=0, dtype=np.int64, additive=False):
+  """Generator over (start, values) pairs covering sieve(...)'s result.
+
+  Only one segment of SEGMENT_SIZE values and the primes up to sqrt(lim) are
+  kept in memory, so lim can be arbitrarily large.
+  """
+  base_primes = primes.sieve(math.isqrt(max(lim, 1) - 1) + 1)
+
+  for seg_lo in range(lo, lim, SEGMENT_SIZE):
+    seg_hi = min(seg_lo + SEGMENT_SIZE, lim)
+    yield seg_lo, _sieve_segment(
+        seg_lo, seg_hi, base_primes, prime_power, dtype, additive)
+
+
+def totient(lim, lo=0):
+  """Euler's φ(n) for n in [lo, lim)."""
+  return sieve(lim, _totient, lo=lo)
+
+
+def mobius(lim, lo=0):
+  """Möbius μ(n) for n in [lo, lim)."""
+  return sieve(lim, _mobius, lo=lo, dtype=np.int8)
+
+
+def divisor_sigma(lim, k=1, lo=0):
+  """σ_k(n) for n in [lo, lim), the sum of the k-th powers of n's divisors.
+
+  Wraps around silently once σ_k(n) exceeds the int64 range.
+  """
+  return sieve(lim, lambda p, e: _divisor_sigma(p, e, k), lo=lo)
+
+
+def divisor_count(lim, lo=0):
+  """d(n), the number of divisors of n, for n in [lo, lim)."""
+  return sieve(lim, lambda p, e: e + 1, lo=lo)
+
+
+def big_omega(lim, lo=0):
+  """Ω(n) for n in [lo, lim), the number of prime factors with multiplicity."""
+  return sieve(lim, lambda p, e: e, lo=lo, dtype=np.int8, additive=True)
+
+
+def _sieve_segment(lo, hi, base_primes, prime_power, dtype, additive):
+  # Each base prime p divides out of its multiples all at once, with the
+  # exponents counted by sieving by p, p**2, ... What remains of n after all
+  # the base primes is 1 or its one prime factor above sqrt(hi).
+  remainders = np.arange(lo, hi, dtype=np.int64)
+  values = np.full(hi - lo, 0 if additive else 1, dtype=dtype)
+  exponents = np.zeros(hi - lo, dtype=np.int64)
+
+  if lo == 0:
+    remainders[0] = 1
+
+  for p in base_primes:
+    if p * p >= hi:
+      break
+
+    pk = p
+    while pk < hi:
+      exponents[(-lo) % pk::pk] += 1
+      pk *= p
+
+    multiples = slice((-lo) % p, None, p)
+    e = exponents[multiples]
+    f = prime_power(np.full(len(e), p, dtype=np.int64), e)
+
+    if additive:
+      values[multiples] += f.astype(dtype, copy=False)
+    else:
+      values[multiples] *= f.astype(dtype, copy=False)
+    remainders[multiples] //= p**e
+    exponents[multiples] = 0
+
+  large = remainders > 1
+  f = prime_power(
+      remainders[large], np.ones(np.count_nonzero(large), dtype=np.int64))
+  if additive:
+    values[large] += f.astype(dtype, copy=False)
+  else:
+    values[large] *= f.astype(dtype, copy=False)
+
+  if lo == 0:
+    values[0] = 0
+
+  return values
+
+
+def _totient(p, e):
+  return p**(e - 1) * (p - 1)
+
+
+def _mobius(p, e):
+  return np.where(e == 1, -1, 0)
+
+
+def _divisor_sigma(p, e, k):
+  # 1 + p**k + ... + p**(k*e), one power at a time.
+  ret = np.ones(len(p), dtype=np.int64)
+  term = np.ones(len(p), dtype=np.int64)
+  pk = p**k
+
+  for i in range(1, int(e.max(initial=0)) + 1):
+    term *= pk
+    ret += np.where(i <= e, term, 0)
+
+  return ret
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primes
+
+import math
+
+import numpy as np
+
+
+_SMALL_PRIMES = primes.sieve(1000)
+_SMALL_PRIMES_SET = frozenset(_SMALL_PRIMES)
+_SMALL_PRIMES_PRODUCT = math.prod(_SMALL_PRIMES)
+_SMALL_PRIMES_UINT64_PRODUCT = math.prod(p for p in _SMALL_PRIMES if p < 48)
+
+# Fewer values in [2**32, 2**64) than this are quicker to test one by one
+# than through the few thousand NumPy calls of _is_prime_array_64_bit.
+_MIN_64_BIT_BATCH = 4096
+
+# (bound, bases) such that Miller-Rabin with these bases is deterministic for
+# every n < bound (Jaeschke, Sinclair).
+_MILLER_RABIN_DETERMINISTIC_BASES = (
+    (4759123141, (2, 7, 61)),
+    (1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+)
+
+
+def is_prime(n):
+  """Primality test that never touches the cached sieve.
+
+  Small prime filter, then deterministic Miller-Rabin below 2**64 and
+  Baillie-PSW above. No Baillie-PSW pseudoprime is known.
+  """
+  if n < 2:
+    return False
+
+  if math.gcd(n, _SMALL_PRIMES_PRODUCT) != 1:
+    return n in _SMALL_PRIMES_SET
+
+  if n < _SMALL_PRIMES[-1]**2:
+    return True
+
+  for bound, bases in _MILLER_RABIN_DETERMINISTIC_BASES:
+    if n < bound:
+      return all(_is_strong_probable_prime(n, base) for base in bases)
+
+  return (
+      _is_strong_probable_prime(n, 2)
+      and _is_strong_lucas_probable_prime(n))
+
+
+def is_prime_array(ns):
+  """Boolean ndarray of is_prime over each element of an integer array.
+
+  Values below 2**64 go through deterministic Miller-Rabin, run over the whole
+  array at once in uint64 arithmetic: plain products below 2**32, Montgomery
+  products from 32-bit halves above, as long as there are enough such values
+  to pay off. Larger values are tested one by one.
+  """
+  ns = np.asarray(ns)
+  ret = np.zeros(ns.shape, dtype=bool)
+
+  if ns.dtype == object:
+    fits_32_bit = np.array(
+        [0 <= n < 1 << 32 for n in ns.ravel()], dtype=bool).reshape(ns.shape)
+    fits_64_bit = np.array(
+        [0 <= n < 1 << 64 for n in ns.ravel()], dtype=bool).reshape(ns.shape)
+  else:
+    fits_32_bit = (ns >= 0) & (ns < 1 << 32)
+    fits_64_bit = ns >= 0
+
+  ret[fits_32_bit] = _is_prime_array_32_bit(ns[fits_32_bit].astype(np.uint64))
+
+  large = fits_64_bit & ~fits_32_bit
+  if np.count_nonzero(large) >= _MIN_64_BIT_BATCH:
+    ret[large] = _is_prime_array_64_bit(ns[large].astype(np.uint64))
+    one_by_one = ~fits_64_bit
+  else:
+    one_by_one = ~fits_32_bit
+
+  for index in zip(*np.nonzero(one_by_one)):
+    ret[index] = is_prime(int(ns[index]))
+
+  return ret
+
+
+def jacobi(a, n):
+  if n <= 0 or n % 2 == 0:
+    raise ValueError("n must be an odd positive integer")
+
+  a %= n
+  ret = 1
+
+  while a:
+    while a % 2 == 0:
+      a //= 2
+      if n % 8 in (3, 5):
+        ret = -ret
+
+    a, n = n, a
+    if a % 4 == 3 and n % 4 == 3:
+      ret = -ret
+
+    a %= n
+
+  return ret if n == 1 else 0
+
+
+def _is_strong_probable_prime(n, base):
+  # Miller-Rabin round, n odd.
+  base %= n
+  if base == 0:
+    return True
+
+  d = n - 1
+  s = (d & -d).bit_length() - 1
+  d >>= s
+
+  x = pow(base, d, n)
+  if x == 1 or x == n - 1:
+    return True
+
+  for _ in range(s - 1):
+    x = x * x % n
+    if x == n - 1:
+      return True
+
+  return False
+
+
+def _is_prime_array_32_bit(ns):
+  # ns is a uint64 array of values below 2**32, so products fit in uint64.
+  ret = np.isin(ns, _SMALL_PRIMES)
+  candidates = np.flatnonzero(
+      (ns > _SMALL_PRIMES[-1])
+      & (np.gcd(ns, np.uint64(_SMALL_PRIMES_UINT64_PRODUCT)) == 1))
+
+  ns = ns[candidates]
+  d, s = _odd_parts(ns - np.uint64(1))
+
+  probable_prime = np.ones(ns.shape, dtype=bool)
+  for base in _MILLER_RABIN_DETERMINISTIC_BASES[0][1]:
+    x = _pow_mod_array(np.full(ns.shape, base, dtype=np.uint64), d, ns)
+    passed = (x == 1) | (x == ns - np.uint64(1))
+
+    for r in range(1, int(s.max(initial=0))):
+      x = x * x % ns
+      passed |= (x == ns - np.uint64(1)) & (np.uint64(r) < s)
+
+    probable_prime &= passed
+
+  ret[candidates] = probable_prime
+
+  return ret
+
+
+def _is_prime_array_64_bit(ns):
+  # ns is a uint64 array of values in [2**32, 2**64), whose products don't fit
+  # in uint64. Base 2 alone rules out almost every composite left, so the
+  # other bases then go through the rest all at once.
+  ret = np.zeros(ns.shape, dtype=bool)
+  candidates = np.flatnonzero(
+      np.gcd(ns, np.uint64(_SMALL_PRIMES_UINT64_PRODUCT)) == 1)
+
+  bases = _MILLER_RABIN_DETERMINISTIC_BASES[1][1]
+  for bases_batch in (bases[:1], bases[1:]):
+    moduli = ns[candidates]
+    d, s = _odd_parts(moduli - np.uint64(1))
+    montgomery = _Montgomery(moduli)
+
+    # One row per base.
+    x = montgomery.pow(
+        np.array(bases_batch, dtype=np.uint64)[:, np.newaxis], d)
+    passed = (x == montgomery.one) | (x == montgomery.minus_one)
+
+    for r in range(1, int(s.max(initial=0))):
+      x = montgomery.mul(x, x)
+      passed |= (x == montgomery.minus_one) & (np.uint64(r) < s)
+
+    candidates = candidates[passed.all(axis=0)]
+
+  ret[candidates] = True
+
+  return ret
+
+
+def _odd_parts(ns):
+  # d and s such that ns == d << s with d odd, for positive uint64 ns.
+  d = ns.copy()
+  s = np.zeros(ns.shape, dtype=np.uint64)
+  while True:
+    even = (d & np.uint64(1)) == 0
+    if not even.any():
+      break
+    d[even] >>= np.uint64(1)
+    s[even] += np.uint64(1)
+
+  return d, s
+
+
+class _Montgomery(object):
+  """Elementwise arithmetic modulo an array of odd uint64 moduli.
+
+  Values are kept in Montgomery form, x * 2**64 % moduli, in which products
+  reduce with uint64 operations only.
+  """
+
+  def __init__(self, moduli):
+    self.moduli = moduli
+
+    # -moduli**-1 % 2**64. moduli**2 % 8 == 1, so moduli is its own inverse
+    # to 3 bits, and each Newton step doubles the bits that are right.
+    inverses = moduli.copy()
+    for _ in range(5):
+      inverses *= np.uint64(2) - moduli * inverses
+    self._minus_inverses = np.uint64(0) - inverses
+
+    self.one = (np.uint64(0) - moduli) % moduli  # 2**64 % moduli
+    self.minus_one = moduli - self.one
+    self._r2 = self.one  # 2**128 % moduli, by 64 doublings.
+    for _ in range(64):
+      self._r2 = self._add(self._r2, self._r2)
+
+  def mul(self, a, b):
+    """Montgomery product, a * b / 2**64 % moduli."""
+    hi, lo = _mul_128_bit(a, b)
+    m = lo * self._minus_inverses
+    mn_hi, _ = _mul_128_bit(m, self.moduli)
+
+    # lo + m * moduli is a multiple of 2**64, carrying 1 unless lo is 0. The
+    # sum is below 2 * moduli, but may overflow uint64.
+    t = hi + mn_hi
+    overflow = t < hi
+    ret = t + (lo != 0).astype(np.uint64)
+    overflow |= ret < t
+
+    return np.where(overflow | (ret >= self.moduli), ret - self.moduli, ret)
+
+  def pow(self, bases, exponents):
+    """Montgomery form of bases**exponents % moduli, for bases below 2**32.
+
+    Broadcasts like the moduli, so bases may have more dimensions.
+    """
+    ret = self.one
+    bases = self.mul(bases, self._r2)
+    exponents = exponents.copy()
+
+    while exponents.any():
+      odd = (exponents & np.uint64(1)).astype(bool)
+      ret = np.where(odd, self.mul(ret, bases), ret)
+      bases = self.mul(bases, bases)
+      exponents >>= np.uint64(1)
+
+    return ret
+
+  def _add(self, a, b):
+    ret = a + b
+    return np.where((ret < a) | (ret >= self.moduli), ret - self.moduli, ret)
+
+
+def _mul_128_bit(a, b):
+  # High and low uint64 halves of the products of uint64 arrays, from the
+  # products of their 32-bit halves.
+  mask = np.uint64(0xFFFFFFFF)
+  shift = np.uint64(32)
+  a_hi, a_lo = a >> shift, a & mask
+  b_hi, b_lo = b >> shift, b & mask
+
+  lo_lo = a_lo * b_lo
+  hi_lo = a_hi * b_lo
+  lo_hi = a_lo * b_hi
+  middle = (lo_lo >> shift) + (hi_lo & mask) + (lo_hi & mask)
+
+  return (
+      a_hi * b_hi + (hi_lo >> shift) + (lo_hi >> shift) + (middle >> shift),
+      a * b,
+  )
+
+
+def _pow_mod_array(bases, exponents, moduli):
+  # Elementwise bases**exponents % moduli, all uint64 below 2**32.
+  ret = np.ones(bases.shape, dtype=np.uint64)
+  bases = bases.copy()
+  exponents = exponents.copy()
+
+  while exponents.any():
+    odd = (exponents & np.uint64(1)).astype(bool)
+    ret = np.where(odd, ret * bases % moduli, ret)
+    bases = bases * bases % moduli
+    exponents >>= np.uint64(1)
+
+  return ret
+
+
+def _is_strong_lucas_probable_prime(n):
+  # Strong Lucas test with Selfridge's parameters, n odd and not a square.
+  if math.isqrt(n)**2 == n:
+    return False
+
+  d = 5
+  while True:
+    j = jacobi(d, n)
+    if j == -1:
+      break
+    if j == 0 and abs(d) != n:
+      return False
+    d = -d - 2 if d > 0 else -d + 2
+
+  p = 1
+  q = (1 - d) // 4
+
+  k = n + 1
+  s = (k & -k).bit_length() - 1
+  k >>= s
+
+  def halve(x):
+    return (x + n if x % 2 else x) // 2 % n
+
+  # U_1, V_1, Q**1, then double-and-add over the remaining bits of k.
+  u, v, qk = 1, p, q % n
+  for bit in bin(k)[3:]:
+    u, v = u * v % n, (v * v - 2 * qk) % n
+    qk = qk * qk % n
+
+    if bit == "1":
+      u, v = halve(p * u + v), halve(d * u + p * v)
+      qk = qk * q % n
+
+  if u == 0 or v == 0:
+    return True
+
+  for _ in range(s - 1):
+    v = (v * v - 2 * qk) % n
+    if v == 0:
+      return True
+    qk = qk * qk % n
+
+  return False
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+
+import collections.abc
+import operator
+
+import numpy as np
+
+
+# One byte per 30 numbers: bit j of byte k tells whether 30*k + _RESIDUES[j]
+# is in the set. Every prime but 2, 3 and 5 is coprime with 30.
+_WHEEL = 30
+_RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+_WHEEL_PRIMES = (2, 3, 5)
+
+# _BIT_OF_RESIDUE[r] is the bit of residue r, -1 if r is not coprime with 30.
+_BIT_OF_RESIDUE = [-1] * _WHEEL
+for _j, _r in enumerate(_RESIDUES):
+  _BIT_OF_RESIDUE[_r] = _j
+del _j, _r
+
+_BIT_OF_RESIDUE_ARRAY = np.array(_BIT_OF_RESIDUE, dtype=np.int8)
+_RESIDUES_ARRAY = np.array(_RESIDUES, dtype=np.int64)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+# _BELOW_RESIDUE[r] masks the bits of the residues below r.
+_BELOW_RESIDUE = [sum(1 << j for j, s in enumerate(_RESIDUES) if s < r)
+                  for r in range(_WHEEL)]
+
+# Bytes per block of rank and select's cumulative counts.
+_BLOCK_SIZE = 64
+
+
+class PrimeBitset(collections.abc.Set):
+  """Immutable set of primes below lim, stored in a mod 30 wheel bitset.
+
+  Takes one bit per 30/8 numbers, against several dozen bytes per element
+  for a set of ints, with O(1) membership tests. Supports rank and select
+  and, as a collections.abc.Set, comparisons with other sets.
+  """
+
+  __slots__ = ("_lim", "_bits", "_block_counts", "_len")
+
+  def __init__(self, ps=(), lim=0):
+    """Bitset of ps, the sorted list of all the primes below lim."""
+    self._init(bytearray(-(-lim // _WHEEL)), 0, ps, lim)
+
+  def extended(self, ps, lim):
+    """New PrimeBitset with ps, all the primes in [self.lim, lim), added."""
+    ret = PrimeBitset.__new__(PrimeBitset)
+    bits = bytearray(self._bits)
+    bits.extend(bytes(-(-lim // _WHEEL) - len(bits)))
+    ret._init(bits, self._len, ps, lim)
+
+    return ret
+
+  def _init(self, bits, length, ps, lim):
+    ps = np.asarray(ps, dtype=np.int64)
+    wheel_ps = ps[ps > _WHEEL_PRIMES[-1]]
+
+    flags = np.unpackbits(
+        np.frombuffer(bits, dtype=np.uint8), bitorder="little").astype(bool)
+    flags[wheel_ps // _WHEEL * 8 + _BIT_OF_RESIDUE_ARRAY[wheel_ps % _WHEEL]] = (
+        True)
+
+    self._lim = lim
+    self._bits = np.packbits(flags, bitorder="little").tobytes()
+    self._len = length + len(ps)
+
+    # _block_counts[i] counts the wheel bits set before byte i*_BLOCK_SIZE,
+    # plus the wheel primes.
+    popcounts = _POPCOUNT[np.frombuffer(self._bits, dtype=np.uint8)]
+    block_sums = np.add.reduceat(
+        popcounts, np.arange(0, len(popcounts), _BLOCK_SIZE), dtype=np.int64
+    ) if len(popcounts) else np.empty(0, dtype=np.int64)
+    self._block_counts = np.concatenate(
+        [[0], np.cumsum(block_sums)]) + self._num_wheel_primes()
+
+  @property
+  def lim(self):
+    return self._lim
+
+  def __contains__(self, n):
+    try:
+      n = operator.index(n)
+    except TypeError:
+      return False
+
+    if not 0 <= n < self._lim:
+      return False
+
+    bit = _BIT_OF_RESIDUE[n % _WHEEL]
+    if bit < 0:
+      return n in _WHEEL_PRIMES
+
+    return bool(self._bits[n // _WHEEL] >> bit & 1)
+
+  def __iter__(self):
+    for p in _WHEEL_PRIMES[:self._num_wheel_primes()]:
+      yield p
+
+    chunk = 1 << 16
+    bits = np.frombuffer(self._bits, dtype=np.uint8)
+    for lo in range(0, len(bits), chunk):
+      indices = np.flatnonzero(
+          np.unpackbits(bits[lo:lo + chunk], bitorder="little"))
+      yield from (_WHEEL * (lo + (indices >> 3))
+                  + _RESIDUES_ARRAY[indices & 7]).tolist()
+
+  def __len__(self):
+    return self._len
+
+  def __repr__(self):
+    return f"PrimeBitset(<{self._len} primes below {self._lim}>)"
+
+  def __reduce__(self):
+    return _from_bits, (self._bits, self._lim, self._len)
+
+  @classmethod
+  def _from_iterable(cls, it):
+    # Results of &, |, - and ^ need not be primes below some lim.
+    return frozenset(it)
+
+  def lookup(self, ns):
+    """Boolean ndarray telling which of ns are in the set.
+
+    ns must be an int64 array of values in [0, lim).
+    """
+    bits = np.frombuffer(self._bits, dtype=np.uint8)
+    residue_bits = _BIT_OF_RESIDUE_ARRAY[ns % _WHEEL]
+
+    in_wheel = (bits[ns // _WHEEL] >> np.maximum(residue_bits, 0).astype(
+        np.uint8)) & 1
+
+    return np.where(residue_bits >= 0, in_wheel.astype(bool),
+                    np.isin(ns, _WHEEL_PRIMES))
+
+  def rank(self, n):
+    """Number of elements below n."""
+    n = min(max(n, 0), self._lim)
+    k, r = divmod(n, _WHEEL)
+    block = k // _BLOCK_SIZE
+
+    ret = int(self._block_counts[block])
+    ret += int(_POPCOUNT[np.frombuffer(
+        self._bits, dtype=np.uint8, count=k - block * _BLOCK_SIZE,
+        offset=block * _BLOCK_SIZE)].sum())
+    if r:
+      ret += bin(self._bits[k] & _BELOW_RESIDUE[r]).count("1")
+
+    # _block_counts includes every wheel prime below lim.
+    return ret - sum(1 for p in _WHEEL_PRIMES if n <= p < self._lim)
+
+  def select(self, i):
+    """The element of rank i, that is the (i + 1)-th smallest."""
+    if not 0 <= i < self._len:
+      raise IndexError("PrimeBitset index out of range")
+
+    if i < self._num_wheel_primes():
+      return _WHEEL_PRIMES[i]
+
+    block = int(np.searchsorted(self._block_counts, i, side="right")) - 1
+    count = int(self._block_counts[block])
+
+    for k in range(block * _BLOCK_SIZE, len(self._bits)):
+      byte = self._bits[k]
+      c = int(_POPCOUNT[byte])
+      if count + c > i:
+        for j, r in enumerate(_RESIDUES):
+          if byte >> j & 1:
+            if count == i:
+              return _WHEEL * k + r
+            count += 1
+      count += c
+
+    raise AssertionError("unreachable")
+
+  def _num_wheel_primes(self):
+    return sum(1 for p in _WHEEL_PRIMES if p < self._lim)
+
+
+def _from_bits(bits, lim, length):
+  # Unpickles a PrimeBitset without going through its primes.
+  ret = PrimeBitset.__new__(PrimeBitset)
+  ret._init(bytearray(bits), length, (), lim)
+  return ret
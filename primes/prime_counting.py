@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primes
+
+import math
+
+import numpy as np
+
+
+def prime_pi(x):
+  """π(x), the number of primes p <= x.
+
+  Meissel-Lehmer style: Legendre's recurrence
+    φ(v, p) = φ(v, p - 1) - (φ(v // p, p - 1) - φ(p - 1, p - 1))
+  for the count of numbers in [2, v] not crossed off by the primes below p,
+  run for all the O(sqrt(x)) distinct values v = x // k at once, one prime
+  p <= sqrt(x) at a time. Takes O(x**(3/4)) time and O(sqrt(x)) memory.
+  """
+  x = int(x)
+  if x < 2:
+    return 0
+
+  r = math.isqrt(x)
+
+  # small[v] = φ(v, p) for v <= r, large[k - 1] = φ(x // k, p) for k <= r.
+  small = np.arange(-1, r, dtype=np.int64)
+  small[0] = 0
+  large = x // np.arange(1, r + 1, dtype=np.int64) - 1
+
+  for p in primes.sieve(r + 1):
+    count_below_p = small[p - 1]
+    p2 = p * p
+
+    # x // k >= p**2. φ(x // (k*p)) is in large while k*p <= r.
+    k_stop = min(r, x // p2) + 1
+    k_split = min(k_stop, r // p + 1)
+    quotients = np.concatenate([
+        large[p - 1:(k_split - 1) * p:p],
+        small[x // (np.arange(k_split, k_stop, dtype=np.int64) * p)],
+    ])
+    large[:k_stop - 1] -= quotients - count_below_p
+
+    # v >= p**2, from the values before this step: fancy indexing copies.
+    if p2 <= r:
+      small[p2:] -= small[np.arange(p2, r + 1) // p] - count_below_p
+
+  return int(large[0])
+
+
+def nth_prime(n):
+  """The n-th prime, counting from nth_prime(1) == 2.
+
+  Counts the primes up to an analytic estimate of it with prime_pi, then
+  sieves segments of about sqrt(estimate) numbers towards it.
+  """
+  if n < 1:
+    raise ValueError("n must be a positive integer")
+
+  if n < 6:
+    return (2, 3, 5, 7, 11)[n - 1]
+
+  x = _estimate_nth_prime(n)
+  count = prime_pi(x)  # of the primes <= x
+  width = max(2 * math.isqrt(x), 1 << 12)
+
+  while count < n:
+    ps = primes.sieve(x + 1 + width, compact=True, start=x + 1)
+    if count + len(ps) >= n:
+      return int(ps[n - count - 1])
+
+    count += len(ps)
+    x += width
+
+  while True:
+    lo = max(x + 1 - width, 0)
+    ps = primes.sieve(x + 1, compact=True, start=lo)
+    if count - len(ps) < n:
+      return int(ps[n - (count - len(ps)) - 1])
+
+    count -= len(ps)
+    x = lo - 1
+
+
+def _estimate_nth_prime(n):
+  # Cipolla's asymptotic expansion, within a fraction of a percent for n >= 6.
+  log_n = math.log(n)
+  log_log_n = math.log(log_n)
+
+  return int(n * (log_n + log_log_n - 1 + (log_log_n - 2) / log_n))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primes
+
+import collections.abc
+import contextlib
+import fcntl
+import math
+import mmap
+import operator
+import os
+import struct
+
+import numpy as np
+
+
+# Prime tables are bit-packed over the odd numbers: bit i (little-endian
+# within each byte) tells whether 2*i + 1 is prime. 2 is special-cased.
+
+_MAGIC = b"ALGPRIME"
+_VERSION = 1
+# Magic, version, reserved, lim: the table covers the numbers below lim.
+_HEADER = struct.Struct("<8sIIQ")
+
+# Numbers sieved per write while growing a file, a multiple of 16 so that
+# every chunk fills whole bytes.
+_GROWTH_CHUNK = 1 << 24
+# Numbers unpacked at once while iterating over or counting a table, also a
+# multiple of 16.
+_READ_CHUNK = 1 << 20
+
+
+def pack_primes(ps, lim):
+  """Prime table for [0, lim) from the sorted primes below lim."""
+  ps = np.asarray(ps, dtype=np.int64)
+  flags = np.zeros((lim + 1) // 2, dtype=bool)
+  flags[ps[ps % 2 == 1] // 2] = True
+
+  return np.packbits(flags, bitorder="little")
+
+
+def _primes(bits, lim, start):
+  # The primes in [start, lim) of a table covering at least lim.
+  lo = start // 16 * 16
+  if lim <= lo:
+    return np.empty(0, dtype=np.int64)
+
+  flags = np.unpackbits(bits[lo // 16:-(-lim // 16)], bitorder="little")
+  ps = lo + 2 * np.flatnonzero(flags[:(lim - lo) // 2]).astype(np.int64) + 1
+
+  if start <= 2 < lim:
+    ps = np.concatenate([[2], ps])
+
+  return ps[ps >= start]
+
+
+def lookup(bits, ns):
+  """Boolean ndarray telling which of ns are prime.
+
+  ns must be an int64 array of values in [0, lim) for the lim bits covers.
+  """
+  odd_indices = ns >> 1
+  odd_prime = (bits[odd_indices >> 3] >> (odd_indices & 7).astype(np.uint8)) & 1
+
+  return np.where(ns % 2 == 1, odd_prime.astype(bool), ns == 2)
+
+
+class PrimeTableSet(collections.abc.Set):
+  """Read-only set of the primes below lim, viewing a prime table's bits.
+
+  Nothing is copied out of bits, which may be a view of a PrimeTableFile's
+  mmap, so the set takes no memory of its own.
+  """
+
+  __slots__ = ("_bits", "_lim", "_len")
+
+  def __init__(self, bits, lim):
+    self._bits = bits
+    self._lim = lim
+    self._len = None
+
+  @property
+  def lim(self):
+    return self._lim
+
+  def __contains__(self, n):
+    try:
+      n = operator.index(n)
+    except TypeError:
+      return False
+
+    if not 0 <= n < self._lim:
+      return False
+
+    if n % 2 == 0:
+      return n == 2
+
+    i = n // 2
+    return bool(self._bits[i // 8] >> (i % 8) & 1)
+
+  def __iter__(self):
+    for lo in range(0, self._lim, _READ_CHUNK):
+      yield from _primes(
+          self._bits, min(lo + _READ_CHUNK, self._lim), lo).tolist()
+
+  def __len__(self):
+    if self._len is None:
+      self._len = sum(
+          len(_primes(self._bits, min(lo + _READ_CHUNK, self._lim), lo))
+          for lo in range(0, self._lim, _READ_CHUNK))
+
+    return self._len
+
+  def __repr__(self):
+    return f"PrimeTableSet(<primes below {self._lim}>)"
+
+  @classmethod
+  def _from_iterable(cls, it):
+    # Results of &, |, - and ^ need not be primes below some lim.
+    return frozenset(it)
+
+  def lookup(self, ns):
+    """Boolean ndarray telling which of ns are in the set.
+
+    ns must be an int64 array of values in [0, lim).
+    """
+    return lookup(self._bits, ns)
+
+
+class PrimeTableFile(object):
+  """Prime table in a versioned binary file, shared between processes.
+
+  The file is opened with mmap, so every process using it shares the same
+  pages. ensure() grows it in place, sieving only the numbers it doesn't
+  cover yet, under an exclusive lock on the file.
+  """
+
+  def __init__(self, path):
+    self.path = path
+    self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+
+    with self._locked():
+      if os.fstat(self._file.fileno()).st_size == 0:
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0))
+        self._file.flush()
+
+    try:
+      self._map()
+    except ValueError:
+      self._file.close()
+      raise
+
+  @property
+  def lim(self):
+    return self._lim
+
+  @property
+  def bits(self):
+    return self._bits
+
+  def ensure(self, min_lim):
+    """Grows the table, if needed, to cover at least the numbers below min_lim."""
+    if self._lim >= min_lim:
+      return
+
+    with self._locked():
+      self._map()  # Another process may have grown it meanwhile.
+
+      if self._lim < min_lim:
+        new_lim = max(min_lim, 2 * self._lim)
+        self._grow(-(-new_lim // 16) * 16)
+
+    self._map()
+
+  def is_prime(self, n):
+    if n % 2 == 0:
+      return n == 2
+
+    i = n // 2
+    return bool(self._bits[i // 8] >> (i % 8) & 1)
+
+  def primes(self, lim, start=0):
+    """NumPy array of the primes in [start, min(lim, self.lim))."""
+    return _primes(self._bits, min(lim, self._lim), start)
+
+  def primes_set(self):
+    """PrimeTableSet of the primes below self.lim, a view of the file."""
+    return PrimeTableSet(self._bits, self._lim)
+
+  def close(self):
+    self._bits = None
+    self._mmap = None
+    self._file.close()
+
+  def _map(self):
+    self._file.flush()
+    self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, _, lim = _HEADER.unpack_from(self._mmap)
+    if magic != _MAGIC or version != _VERSION:
+      raise ValueError(
+          f"{self.path} is not a version {_VERSION} prime table file")
+
+    self._lim = lim
+    self._bits = np.frombuffer(
+        self._mmap, dtype=np.uint8, count=-(-lim // 16), offset=_HEADER.size)
+
+  def _grow(self, new_lim):
+    # lim and new_lim are multiples of 16, so whole bytes are appended. The
+    # header is only rewritten once the data is in place.
+    lim = self._lim
+    base_primes = primes.sieve(math.isqrt(new_lim - 1) + 1)[1:]
+
+    self._file.seek(_HEADER.size + lim // 16)
+    self._file.truncate()
+
+    for lo in range(lim, new_lim, _GROWTH_CHUNK):
+      hi = min(lo + _GROWTH_CHUNK, new_lim)
+
+      ps = primes.segment_primes(lo + 1, hi, base_primes).astype(np.int64)
+      flags = np.zeros((hi - lo) // 2, dtype=bool)
+      flags[(ps - lo - 1) // 2] = True
+
+      self._file.write(np.packbits(flags, bitorder="little").tobytes())
+
+    self._file.flush()
+    os.fsync(self._file.fileno())
+
+    self._file.seek(0)
+    self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0, new_lim))
+    self._file.flush()
+    os.fsync(self._file.fileno())
+
+  @contextlib.contextmanager
+  def _locked(self):
+    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+    try:
+      yield
+    finally:
+      fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
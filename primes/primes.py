@@ -1,22 +1,185 @@
 #!/usr/bin/env python3
 
 
-def sieve(lim):
-  if lim <= 2:
-    return []
+import concurrent.futures
+import itertools
+import math
+import os
+
+import numpy as np
+
+
+# Odd numbers per segment. One byte each, so a segment fits in a typical L2
+# cache.
+SEGMENT_SIZE = 1 << 19
+
+# Small primes whose multiples are crossed off by copying a precomputed
+# periodic pattern instead of one slice assignment each.
+_PRESIEVE_PRIMES = (3, 5, 7, 11, 13)
+
+
+def sieve(lim, compact=False, processes=1, start=2):
+  """Primes below lim, and at least start.
+
+  Returns a list, or a NumPy array of unsigned integers when compact is set.
+  Memory use is proportional to SEGMENT_SIZE plus the size of the result.
+
+  With processes other than 1, the segments are sieved by a process pool of
+  that many workers (all the cores if None), each sending back one compact
+  array per chunk of segments.
+  """
+  dtype = _dtype(lim)
+  chunks = [np.empty(0, dtype=dtype)]
+
+  if start <= 2 < lim:
+    chunks.append(np.array([2], dtype=dtype))
+
+  lo = max(start, 3) | 1
+  if lim > lo:
+    base_primes = _odd_primes(math.isqrt(lim - 1) + 1)
+
+    if processes == 1:
+      chunks.append(_sieve_range(lo, lim, base_primes, SEGMENT_SIZE))
+    else:
+      chunks += _parallel_sieve_range(
+          lo, lim, base_primes, SEGMENT_SIZE, processes)
+
+  ret = np.concatenate(chunks).astype(dtype, copy=False)
+
+  return ret if compact else ret.tolist()
+
+
+def iter_primes(start=2, stop=None):
+  """Generator over the primes in [start, stop), unbounded if stop is None.
+
+  Only the base primes up to sqrt of the current position and one segment are
+  kept in memory.
+  """
+  if start <= 2 and (stop is None or stop > 2):
+    yield 2
+
+  lo = max(start, 3) | 1
+  base_lim = 0  # base_primes are all the odd primes below base_lim.
+  base_primes = []
+
+  while stop is None or lo < stop:
+    hi = lo + 2 * SEGMENT_SIZE
+    if stop is not None:
+      hi = min(hi, stop)
+
+    min_base_lim = math.isqrt(hi - 1) + 1
+    if base_lim < min_base_lim:
+      base_lim = max(min_base_lim, 2 * base_lim)
+      base_primes = _odd_primes(base_lim)
+
+    yield from segment_primes(lo, hi, base_primes).tolist()
+
+    lo = hi
+
+
+def segment_primes(lo, hi, base_primes):
+  """NumPy array of the primes in [lo, hi), lo odd.
+
+  base_primes must contain every odd prime p with p**2 < hi, in increasing
+  order.
+  """
+  flags = _sieve_segment(lo, hi, base_primes)
+  indices = np.flatnonzero(np.frombuffer(flags, dtype=np.bool_))
 
-  ret = [2]
-  si = list(range(3, lim, 2))
+  return lo + 2 * indices.astype(_dtype(hi), copy=False)
 
-  for i in range(len(si)):
-    p = si[i]
-    if p is None:
+
+def _sieve_range(lo, hi, base_primes, segment_size):
+  # Primes in [lo, hi), lo odd, sieved one segment at a time.
+  return np.concatenate(
+      [np.empty(0, dtype=_dtype(hi))]
+      + [
+          segment_primes(seg_lo, min(seg_lo + 2 * segment_size, hi), base_primes)
+          for seg_lo in range(lo, hi, 2 * segment_size)
+      ]
+  )
+
+
+def _parallel_sieve_range(lo, hi, base_primes, segment_size, processes):
+  # Contiguous chunks of whole segments, a few per worker to balance the load.
+  workers = processes or os.cpu_count() or 1
+  segment_starts = range(lo, hi, 2 * segment_size)
+  chunk_starts = segment_starts[::-(-len(segment_starts) // (4 * workers))]
+  chunk_stops = list(chunk_starts[1:]) + [hi]
+
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+    return list(executor.map(
+        _sieve_range,
+        chunk_starts,
+        chunk_stops,
+        itertools.repeat(base_primes),
+        itertools.repeat(segment_size),
+    ))
+
+
+def _sieve_segment(lo, hi, base_primes):
+  # flags[i] tells whether lo + 2*i is prime.
+  n = (hi - lo + 1) // 2
+  zeros = memoryview(bytes(n))
+
+  pattern_start = lo // 2 % len(_PRESIEVE_PATTERN)
+  repeats = (pattern_start + n) // len(_PRESIEVE_PATTERN) + 1
+  flags = (_PRESIEVE_PATTERN * repeats)[pattern_start:pattern_start + n]
+
+  for p in _PRESIEVE_PRIMES:
+    if lo <= p < hi:
+      flags[(p - lo) // 2] = 1
+
+  for p in base_primes:
+    if p <= _PRESIEVE_PRIMES[-1]:
       continue
 
-    ret.append(p)
+    start = p * p
+    if start >= hi:
+      break
+
+    if start < lo:
+      start = lo + (-lo) % p
+      if start % 2 == 0:
+        start += p
+
+    i = (start - lo) // 2
+    flags[i::p] = zeros[:(n - 1 - i) // p + 1]
+
+  if lo <= 1 < hi:
+    flags[(1 - lo) // 2] = 0
+
+  return flags
+
+
+def _odd_primes(lim):
+  # Plain odd-only sieve, used for the base primes of the segmented one.
+  if lim <= 3:
+    return []
+
+  flags = bytearray(b"\x01") * (lim // 2)
+  flags[0] = 0  # 1
+
+  for i in range(1, (math.isqrt(lim - 1) + 1) // 2):
+    if flags[i]:
+      p = 2 * i + 1
+      flags[p * p // 2::p] = bytes(len(range(p * p // 2, len(flags), p)))
+
+  return list(itertools.compress(range(1, lim, 2), flags))
+
+
+def _presieve_pattern():
+  # pattern[j] tells whether 2*j + 1 is coprime with all _PRESIEVE_PRIMES.
+  pattern = bytearray(b"\x01") * math.prod(_PRESIEVE_PRIMES)
+
+  for p in _PRESIEVE_PRIMES:
+    pattern[p // 2::p] = bytes(len(range(p // 2, len(pattern), p)))
+
+  return pattern
+
 
-    for j in range(i+p, len(si), p):
-      si[j] = None
+_PRESIEVE_PATTERN = _presieve_pattern()
 
-  return ret
 
+def _dtype(lim):
+  return np.uint32 if lim <= 1 << 32 else np.uint64
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primality
+from algutils.primes import primes
+
+import concurrent.futures
+import itertools
+import math
+import os
+import random
+
+import numpy as np
+
+
+# (digits, factor base size, sieve interval half-width), interpolated between.
+_PARAMETERS = (
+    (20, 100, 8192),
+    (30, 200, 16384),
+    (40, 450, 32768),
+    (50, 1100, 65536),
+    (60, 2200, 65536),
+    (70, 4500, 131072),
+    (80, 8000, 196608),
+)
+
+_MULTIPLIERS = (
+    1, 3, 5, 7, 11, 13, 15, 17, 19, 21, 23, 29, 31, 33, 35, 37, 39, 41, 43)
+
+# Factor base primes below this are trial divided but not sieved with.
+_SMALL_PRIME_LIM = 32
+
+# Sieved primes with at least this many hits in the interval are sieved one
+# slice assignment at a time, the rest all together.
+_SLICE_SIEVE_MIN_HITS = 64
+
+# Relations beyond the factor base size, so that dependencies exist.
+_EXTRA_RELATIONS = 32
+
+# Partial relations keep a single prime above the factor base, below this
+# many times its largest prime.
+_LARGE_PRIME_MULTIPLIER = 64
+
+# Polynomial families (values of A) sieved per batch of relation collection.
+_FAMILIES_PER_BATCH = 2
+
+
+def find_factor(n, processes=1):
+  """Some non-trivial factor of n, by the self-initialising quadratic sieve.
+
+  n must be odd, composite, not a perfect power and free of prime factors
+  below 1000. With processes other than 1, relations are collected by a
+  process pool of that many workers (all the cores if None or 0).
+  """
+  k = _multiplier(n)
+  factor_base_size, m = _parameters(n)
+  factor_base = _FactorBase(k * n, factor_base_size, m)
+
+  needed = len(factor_base.primes) + 1 + _EXTRA_RELATIONS
+  relations = []
+  seen = set()
+  partials = {}
+  seeds = itertools.count()
+
+  def collect(batch):
+    for full, partial in batch:
+      for u, factors in full:
+        if u not in seen:
+          seen.add(u)
+          relations.append((u, factors))
+
+      for large_prime, u, factors in partial:
+        if u in seen:
+          continue
+        seen.add(u)
+
+        if large_prime not in partials:
+          partials[large_prime] = (u, factors)
+          continue
+
+        # Two partials sharing their large prime multiply to a full relation.
+        other_u, other_factors = partials[large_prime]
+        combined = dict(other_factors)
+        for p, e in factors.items():
+          combined[p] = combined.get(p, 0) + e
+        relations.append((u * other_u % n, combined))
+
+  workers = processes or os.cpu_count() or 1
+  executor = None
+  if workers != 1:
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+  try:
+    while True:
+      while len(relations) < needed:
+        if executor is None:
+          collect([_collect_relations(factor_base, next(seeds))])
+        else:
+          batch_seeds = list(itertools.islice(seeds, workers))
+          collect(executor.map(
+              _collect_relations,
+              itertools.repeat(factor_base),
+              batch_seeds,
+          ))
+
+      d = _factor_from_relations(n, factor_base, relations)
+      if d is not None:
+        return d
+
+      # Only trivial dependencies; gather some more and try again.
+      needed += _EXTRA_RELATIONS
+  finally:
+    if executor is not None:
+      executor.shutdown()
+
+
+class _FactorBase(object):
+  def __init__(self, kn, size, m):
+    self.kn = kn
+    self.m = m
+
+    # 2, then the odd primes p with kn a square mod p, including those
+    # dividing kn.
+    ps = [2]
+    for p in primes.iter_primes(start=3):
+      if len(ps) >= size:
+        break
+      if kn % p == 0 or primality.jacobi(kn, p) == 1:
+        ps.append(p)
+
+    self.primes = ps
+    self.sqrts = [_sqrt_mod(kn, p) for p in ps]
+
+    # Sieved primes: above the small prime limit and not dividing kn.
+    sieved = [
+        i for i, p in enumerate(ps) if p >= _SMALL_PRIME_LIM and kn % p != 0]
+    self.sieved = np.array(sieved, dtype=np.int64)
+    self.trial = sorted(set(range(len(ps))) - set(sieved))
+
+    self.sieved_primes = np.array([ps[i] for i in sieved], dtype=np.int64)
+    self.sieved_sqrts = np.array(
+        [self.sqrts[i] for i in sieved], dtype=np.int64)
+    self.sieved_logs = np.round(np.log2(self.sieved_primes)).astype(np.uint8)
+    self.num_slice_sieved = int(np.searchsorted(
+        self.sieved_primes, 2 * m // _SLICE_SIEVE_MIN_HITS))
+
+    # Q(x) is about m * sqrt(kn / 2) over the interval. Candidates may lack
+    # the small unsieved primes and keep one large prime.
+    large_prime_bound = _LARGE_PRIME_MULTIPLIER * ps[-1]
+    self.large_prime_bound = large_prime_bound
+    self.threshold = int(
+        math.log2(m) + kn.bit_length() / 2 - 0.5
+        - math.log2(large_prime_bound)
+        - sum(math.log2(p) / (p - 1) for p in ps if p < _SMALL_PRIME_LIM))
+
+    # Primes A is built from: mid-sized, sieved, with sqrt(kn) defined.
+    self.a_candidates = [
+        i for i in sieved if 400 < ps[i] < 4000] or sieved[len(sieved) // 2:]
+
+
+def _collect_relations(factor_base, seed):
+  """(full, partial) relations from _FAMILIES_PER_BATCH polynomial families.
+
+  full are (u, factors) with u**2 = prod(p**e for p, e in factors) mod n.
+  partial are (large_prime, u, factors) where factors includes large_prime.
+  """
+  rng = random.Random(seed)
+  full = []
+  partial = []
+
+  for _ in range(_FAMILIES_PER_BATCH):
+    for a, b, a_indices, roots in _polynomials(factor_base, rng):
+      _sieve_polynomial(factor_base, a, b, a_indices, roots, full, partial)
+
+  return full, partial
+
+
+def _polynomials(factor_base, rng):
+  # One family of SIQS polynomials Q(x) = (a*x + b)**2 - kn, sharing a and
+  # walking the 2**(s-1) choices of b in Gray code order. Yields
+  # (a, b, indices of a's primes, (roots1, roots2) over the sieved primes).
+  ps = factor_base.primes
+  sqrts = factor_base.sqrts
+
+  a_indices = _choose_a(factor_base, rng)
+  a = math.prod(ps[i] for i in a_indices)
+
+  bs = []
+  for i in a_indices:
+    q = ps[i]
+    a_over_q = a // q
+    gamma = sqrts[i] * pow(a_over_q, -1, q) % q
+    if gamma > q // 2:
+      gamma = q - gamma
+    bs.append(a_over_q * gamma)
+  b = sum(bs)
+
+  sieved_primes = factor_base.sieved_primes
+  sieved_sqrts = factor_base.sieved_sqrts
+
+  # a's own primes are not sieved with; their roots are kept at -1.
+  in_a = np.isin(factor_base.sieved, a_indices)
+  a_inv = np.array(
+      [0 if skip else pow(a % p, -1, p)
+       for p, skip in zip(sieved_primes.tolist(), in_a.tolist())],
+      dtype=np.int64)
+
+  b_a_inv = [
+      np.array(
+          [2 * (bl % p) * ai % p
+           for p, ai in zip(sieved_primes.tolist(), a_inv.tolist())],
+          dtype=np.int64)
+      for bl in bs]
+
+  b_mod_p = np.array([b % p for p in sieved_primes.tolist()], dtype=np.int64)
+  roots1 = a_inv * (sieved_sqrts - b_mod_p) % sieved_primes
+  roots2 = a_inv * (-sieved_sqrts - b_mod_p) % sieved_primes
+  roots1[in_a] = -1
+  roots2[in_a] = -1
+
+  yield a, b, a_indices, (roots1, roots2)
+
+  for i in range(1, 2**(len(bs) - 1)):
+    v = (i & -i).bit_length() - 1
+    sign = -1 if ((i >> v) + 1) // 2 % 2 else 1
+
+    b += 2 * sign * bs[v]
+    roots1 = (roots1 - sign * b_a_inv[v]) % sieved_primes
+    roots2 = (roots2 - sign * b_a_inv[v]) % sieved_primes
+    roots1[in_a] = -1
+    roots2[in_a] = -1
+
+    yield a, b, a_indices, (roots1, roots2)
+
+
+def _choose_a(factor_base, rng):
+  # Indices of factor base primes whose product is close to sqrt(2kn) / m.
+  ps = factor_base.primes
+  candidates = factor_base.a_candidates
+  target = math.isqrt(2 * factor_base.kn) // factor_base.m
+
+  typical = ps[candidates[len(candidates) // 2]]
+  s = max(2, round(math.log(target) / math.log(typical)))
+  s = min(s, len(candidates) - 1)
+
+  best = None
+  for _ in range(16):
+    chosen = rng.sample(candidates, s - 1)
+    rest = target // math.prod(ps[i] for i in chosen)
+    last = min(
+        (i for i in candidates if i not in chosen),
+        key=lambda i: abs(ps[i] - rest))
+    a_indices = sorted(chosen + [last])
+    error = abs(math.log(math.prod(ps[i] for i in a_indices) / target))
+
+    if best is None or error < best[0]:
+      best = (error, a_indices)
+
+  return best[1]
+
+
+def _sieve_polynomial(factor_base, a, b, a_indices, roots, full, partial):
+  kn = factor_base.kn
+  m = factor_base.m
+  c = (b * b - kn) // a
+
+  sieved_primes = factor_base.sieved_primes
+  roots1, roots2 = roots
+
+  sieve = np.zeros(2 * m, dtype=np.uint8)
+  starts1 = (roots1 + m) % sieved_primes
+  starts2 = (roots2 + m) % sieved_primes
+  used = roots1 >= 0
+  logs = factor_base.sieved_logs
+
+  # Primes hitting the interval often: one slice assignment per root.
+  small = slice(0, factor_base.num_slice_sieved)
+  for p, log_p, start1, start2, use in zip(
+      sieved_primes[small].tolist(), logs[small].tolist(),
+      starts1[small].tolist(), starts2[small].tolist(), used[small].tolist()):
+    if use:
+      sieve[start1::p] += log_p
+      sieve[start2::p] += log_p
+
+  # The rest: all their hits enumerated at once and accumulated by bincount.
+  large = np.flatnonzero(used[factor_base.num_slice_sieved:])
+  large += factor_base.num_slice_sieved
+  ps = np.tile(sieved_primes[large], 2)
+  starts = np.concatenate([starts1[large], starts2[large]])
+  counts = (2 * m - 1 - starts) // ps + 1
+  hit_starts = np.cumsum(counts) - counts
+  hit_numbers = np.arange(counts.sum()) - np.repeat(hit_starts, counts)
+  positions = np.repeat(starts, counts) + np.repeat(ps, counts) * hit_numbers
+  sieve += np.bincount(
+      positions,
+      weights=np.repeat(np.tile(logs[large], 2), counts),
+      minlength=2 * m,
+  ).astype(np.uint8)
+
+  for i in np.flatnonzero(sieve >= factor_base.threshold).tolist():
+    x = i - m
+    factors = _factor_candidate(factor_base, a, b, c, a_indices, roots, x)
+    if factors is None:
+      continue
+
+    u = a * x + b
+    large_prime = factors.pop(None, None)
+    if large_prime is None:
+      full.append((u, factors))
+    else:
+      factors[large_prime] = 1
+      partial.append((large_prime, u, factors))
+
+
+def _factor_candidate(factor_base, a, b, c, a_indices, roots, x):
+  # Factors of a * Q(x) over the factor base, keyed by -1 for the sign and
+  # by None for a single large prime, or None if it doesn't factor.
+  ps = factor_base.primes
+  sieved_primes = factor_base.sieved_primes
+  roots1, roots2 = roots
+
+  v = (a * x + 2 * b) * x + c
+  factors = {}
+  if v < 0:
+    factors[-1] = 1
+    v = -v
+
+  for i in a_indices:
+    factors[ps[i]] = 1
+
+  x_mod_p = x % sieved_primes
+  dividing = factor_base.sieved[(x_mod_p == roots1) | (x_mod_p == roots2)]
+
+  for i in itertools.chain(factor_base.trial, a_indices, dividing.tolist()):
+    p = ps[i]
+    while v % p == 0:
+      v //= p
+      factors[p] = factors.get(p, 0) + 1
+
+  if v == 1:
+    return factors
+
+  if v < factor_base.large_prime_bound:
+    # Every prime below the largest in the factor base has been divided
+    # out, so v is prime as long as it is below that prime's square.
+    factors[None] = v
+    return factors
+
+  return None
+
+
+def _factor_from_relations(n, factor_base, relations):
+  # Finds a congruence of squares among the relations and splits n with it.
+  columns = {p: i for i, p in enumerate([-1] + factor_base.primes)}
+
+  rows = np.zeros((len(relations), -(-len(columns) // 64)), dtype=np.uint64)
+  for r, (_, factors) in enumerate(relations):
+    for p, e in factors.items():
+      if e % 2 == 1:
+        col = columns[p]
+        rows[r, col // 64] |= np.uint64(1) << np.uint64(col % 64)
+
+  for dependency in _gf2_dependencies(rows, len(columns)):
+    x = 1
+    exponents = {}
+    for r in dependency:
+      u, factors = relations[r]
+      x = x * u % n
+      for p, e in factors.items():
+        exponents[p] = exponents.get(p, 0) + e
+
+    y = 1
+    for p, e in exponents.items():
+      if p != -1:
+        y = y * pow(p, e // 2, n) % n
+
+    d = math.gcd(x - y, n)
+    if 1 < d < n:
+      return d
+
+  return None
+
+
+def _gf2_dependencies(rows, num_columns):
+  """Subsets of rows summing to zero over GF(2), as lists of row indices.
+
+  rows is a bit-packed uint64 matrix, one relation per row. Gaussian
+  elimination runs one column at a time, XOR-ing the pivot row into all the
+  other rows with that bit set, while a packed identity matrix alongside
+  records which original rows each row is now a sum of.
+  """
+  num_rows = len(rows)
+  rows = rows.copy()
+  history = np.zeros((num_rows, -(-num_rows // 64)), dtype=np.uint64)
+  history[np.arange(num_rows), np.arange(num_rows) // 64] = (
+      np.uint64(1) << (np.arange(num_rows) % 64).astype(np.uint64))
+
+  is_pivot = np.zeros(num_rows, dtype=bool)
+
+  for col in range(num_columns):
+    word = rows[:, col // 64]
+    has_bit = ((word >> np.uint64(col % 64)) & np.uint64(1)).astype(bool)
+
+    candidates = np.flatnonzero(has_bit & ~is_pivot)
+    if len(candidates) == 0:
+      continue
+
+    pivot = candidates[0]
+    is_pivot[pivot] = True
+
+    others = np.flatnonzero(has_bit)
+    others = others[others != pivot]
+    rows[others] ^= rows[pivot]
+    history[others] ^= history[pivot]
+
+  for r in np.flatnonzero(~is_pivot).tolist():
+    bits = np.unpackbits(history[r].view(np.uint8), bitorder="little")
+    yield np.flatnonzero(bits[:num_rows]).tolist()
+
+
+def _parameters(n):
+  digits = len(str(n))
+
+  for (d0, f0, m0), (d1, f1, m1) in zip(_PARAMETERS, _PARAMETERS[1:]):
+    if digits <= d1:
+      t = min(max((digits - d0) / (d1 - d0), 0), 1)
+      return round(f0 + t * (f1 - f0)), m0 if t < .5 else m1
+
+  _, f, m = _PARAMETERS[-1]
+  return f, m
+
+
+def _multiplier(n):
+  # Knuth-Schroeppel: the k making small primes most likely to divide Q(x).
+  def score(k):
+    kn = k * n
+    ret = -0.5 * math.log(k)
+
+    if kn % 8 == 1:
+      ret += 2 * math.log(2)
+    elif kn % 8 == 5:
+      ret += math.log(2)
+    else:
+      ret += 0.5 * math.log(2)
+
+    for p in primes.sieve(200)[1:]:
+      if kn % p == 0:
+        ret += math.log(p) / p
+      elif primality.jacobi(kn, p) == 1:
+        ret += 2 * math.log(p) / (p - 1)
+
+    return ret
+
+  return max(_MULTIPLIERS, key=score)
+
+
+def _sqrt_mod(a, p):
+  # Tonelli-Shanks: some x with x**2 = a mod p, p prime, a a square mod p.
+  a %= p
+  if a == 0 or p == 2:
+    return a
+
+  q = p - 1
+  s = (q & -q).bit_length() - 1
+  q >>= s
+
+  z = 2
+  while pow(z, (p - 1) // 2, p) != p - 1:
+    z += 1
+
+  x = pow(a, (q + 1) // 2, p)
+  t = pow(a, q, p)
+  c = pow(z, q, p)
+
+  while t != 1:
+    i = 1
+    t2 = t * t % p
+    while t2 != 1:
+      t2 = t2 * t2 % p
+      i += 1
+
+    b = pow(c, 1 << (s - i - 1), p)
+    x = x * b % p
+    c = b * b % p
+    t = t * c % p
+    s = i
+
+  return x
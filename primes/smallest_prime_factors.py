@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primes
+
+import math
+
+import numpy as np
+
+
+_TABLE = np.zeros(2, dtype=np.int32)
+
+
+def get_table(min_lim):
+  """int32 array, at least min_lim long, of the smallest prime factor of n.
+
+  Entries 0 and 1 are 0. Built once, then regrown geometrically on demand.
+  """
+  global _TABLE
+
+  if len(_TABLE) < min_lim:
+    _TABLE = _build_table(max(min_lim, 2 * len(_TABLE)))
+
+  return _TABLE
+
+
+def lim():
+  """Numbers below lim() can be looked up without growing the table."""
+  return len(_TABLE)
+
+
+def _build_table(lim):
+  # Each prime up to sqrt(lim) claims the multiples no smaller prime claimed;
+  # whatever is left unclaimed is prime.
+  table = np.zeros(lim, dtype=np.int32)
+
+  for p in primes.sieve(math.isqrt(lim - 1) + 1):
+    multiples = table[p * p::p]
+    multiples[multiples == 0] = p
+
+  unclaimed = np.flatnonzero(table == 0)
+  table[unclaimed] = unclaimed
+  table[:2] = 0
+
+  return table
@@ -2,9 +2,13 @@
 
 
 from algutils.primes import cached_primes
+from algutils.primes import primes
 
+import threading
 import unittest
 
+import numpy as np
+
 
 class TestIsPrime(unittest.TestCase):
   def test_is_prime(self):
@@ -14,6 +18,24 @@ class TestIsPrime(unittest.TestCase):
     for i in range(lim):
       self.assertEqual(cached_primes.is_prime(i), i in sps)
 
+  def test_is_prime_large(self):
+    self.assertTrue(cached_primes.is_prime(10**18 + 9))
+    self.assertTrue(cached_primes.is_prime(2**127 - 1))
+    self.assertFalse(cached_primes.is_prime((2**61 - 1) * (2**89 - 1)))
+
+
+class TestIsPrimeArray(unittest.TestCase):
+  def test_is_prime_array(self):
+    cached_primes.get_primes_list(min_lim=100)
+
+    ns = np.arange(-2, 1000)
+    want = [cached_primes.is_prime(n) for n in ns.tolist()]
+
+    self.assertEqual(cached_primes.is_prime_array(ns).tolist(), want)
+    self.assertEqual(
+        cached_primes.is_prime_array([2**61 - 1, 10**18 + 9, 2**64 + 1]).tolist(),
+        [True, True, False])
+
 
 class TestGetPrimesList(unittest.TestCase):
   def test_get_primes_list(self):
@@ -30,6 +52,72 @@ class TestGetPrimesSet(unittest.TestCase):
 
     self.assertTrue(want <= got)
 
+  def test_compact(self):
+    want = {2, 3, 5, 7, 11, 13, 17, 19}
+    got = cached_primes.get_primes_set(min_lim=23, compact=True)
+
+    self.assertTrue(want <= got)
+    self.assertNotIn(21, got)
+    self.assertEqual(got, cached_primes.get_primes_set(min_lim=got.lim))
+
+
+class TestGrowth(unittest.TestCase):
+  def test_incremental(self):
+    cached_primes.get_primes_list(min_lim=1000)
+    before = cached_primes.cache_stats()
+
+    for lim in range(before.lim + 1, 2 * before.lim + 1):
+      cached_primes.get_primes_list(min_lim=lim)
+
+    # Growing to before.lim + 1 covers all of them at once.
+    stats = cached_primes.cache_stats()
+    self.assertEqual(stats.growths - before.growths, 1)
+    self.assertEqual(stats.misses - before.misses, 1)
+    self.assertEqual(stats.hits - before.hits, before.lim - 1)
+
+    ps = cached_primes.get_primes_list(min_lim=stats.lim)
+    self.assertEqual(ps[:len(cached_primes.get_primes_set(stats.lim))],
+                     primes.sieve(stats.lim))
+
+  def test_threads(self):
+    lim = 4 * cached_primes.cache_stats().lim
+    want = primes.sieve(lim)
+    errors = []
+
+    def query(i):
+      try:
+        got = cached_primes.get_primes_list(min_lim=lim // 8 * (i % 8 + 1))
+        if got[:len(want)] != want[:len(got)]:
+          errors.append(i)
+        if not cached_primes.is_prime(want[-1]):
+          errors.append(i)
+      except Exception as e:  # pylint: disable=broad-except
+        errors.append(e)
+
+    threads = [threading.Thread(target=query, args=(i,)) for i in range(16)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(errors, [])
+    self.assertEqual(cached_primes.get_primes_list(min_lim=lim)[:len(want)],
+                     want)
+
+  def test_hit_during_growth(self):
+    cached_primes.get_primes_list(min_lim=100)
+    before = cached_primes.cache_stats()
+
+    # Holding _LOCK as a growing thread would, hits still go through.
+    with cached_primes._LOCK:  # pylint: disable=protected-access
+      thread = threading.Thread(
+          target=cached_primes.get_primes_list, kwargs={"min_lim": 100})
+      thread.start()
+      thread.join(timeout=10)
+      self.assertFalse(thread.is_alive())
+
+    self.assertEqual(cached_primes.cache_stats().hits - before.hits, 1)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -5,6 +5,8 @@ from algutils.primes import factorisation
 
 import unittest
 
+import numpy as np
+
 
 class TestFactorise(unittest.TestCase):
   def test_corner_cases(self):
@@ -26,6 +28,111 @@ class TestFactorise(unittest.TestCase):
     self.assertEqual(factorisation.factorise(775), {5: 2, 31: 1})
     self.assertEqual(factorisation.factorise(244), {2: 2, 61: 1})
 
+  def test_large(self):
+    m31 = 2**31 - 1
+    m61 = 2**61 - 1
+    m89 = 2**89 - 1
+
+    self.assertEqual(factorisation.factorise(m89), {m89: 1})
+    self.assertEqual(
+        factorisation.factorise(2**64 - 1),
+        {3: 1, 5: 1, 17: 1, 257: 1, 641: 1, 65537: 1, 6700417: 1})
+    self.assertEqual(
+        factorisation.factorise(4294967311 * 2147483659),
+        {2147483659: 1, 4294967311: 1})
+    self.assertEqual(
+        factorisation.factorise(2**5 * 1009 * 1000000007 * 10000000019),
+        {2: 5, 1009: 1, 1000000007: 1, 10000000019: 1})
+    self.assertEqual(
+        factorisation.factorise(1009**12 * m89**2), {1009: 12, m89: 2})
+    self.assertEqual(
+        factorisation.factorise(m31**2 * m61**3), {m31: 2, m61: 3})
+
+  def test_quadratic_sieve(self):
+    p = 300000000000089
+    q = 7000000000000037
+
+    self.assertEqual(
+        factorisation.factorise(2 * p * q), {2: 1, p: 1, q: 1})
+
+
+class TestFactoriseMany(unittest.TestCase):
+  def test_corner_cases(self):
+    self.assertEqual(factorisation.factorise_many([]), [])
+
+    with self.assertRaises(ValueError):
+      factorisation.factorise_many([1, 0])
+
+    self.assertEqual(
+        factorisation.factorise_many([1, 2, 4, 6]),
+        [{}, {2: 1}, {2: 2}, {2: 1, 3: 1}])
+
+  def test_factorise_many(self):
+    ns = list(range(1, 2000)) + [2**24 - 1, 10**12 + 39]
+    want = [factorisation.factorise(n) for n in ns]
+
+    self.assertEqual(factorisation.factorise_many(ns), want)
+    self.assertEqual(factorisation.factorise_many(np.array(ns)), want)
+    self.assertEqual(factorisation.factorise_many(iter(ns)), want)
+
+
+class TestPollardBrent(unittest.TestCase):
+  def test_pollard_brent(self):
+    for n in (4, 91, 1000003 * 1000033, 4294967311 * 2147483659):
+      d = factorisation.pollard_brent(n)
+
+      self.assertLess(1, d)
+      self.assertLess(d, n)
+      self.assertEqual(n % d, 0)
+
+  def test_max_iterations(self):
+    self.assertIsNone(factorisation.pollard_brent(
+        300000000000089 * 7000000000000037, max_iterations=1000))
+
+
+class TestCache(unittest.TestCase):
+  def tearDown(self):
+    factorisation.use_cache()
+
+  def test_cache(self):
+    self.assertIsNone(factorisation.cache_stats())
+
+    factorisation.use_cache(max_entries=2)
+    want = {2: 1, 3: 1, 2**61 - 1: 1}
+    n = 6 * (2**61 - 1)
+
+    self.assertEqual(factorisation.factorise(n), want)
+    self.assertEqual(factorisation.factorise(n), want)
+    self.assertEqual(factorisation.factorise(10), {2: 1, 5: 1})
+    self.assertEqual(factorisation.factorise(11), {11: 1})
+
+    stats = factorisation.cache_stats()
+    self.assertEqual(
+        (stats.hits, stats.misses, stats.evictions, stats.entries),
+        (1, 3, 1, 2))
+    self.assertGreater(stats.bytes, 0)
+
+  def test_max_bytes(self):
+    factorisation.use_cache(max_bytes=1000)
+
+    for n in range(1, 100):
+      factorisation.factorise(n)
+
+    stats = factorisation.cache_stats()
+    self.assertLessEqual(stats.bytes, 1000)
+    self.assertEqual(stats.entries + stats.evictions, 99)
+
+  def test_copies(self):
+    factorisation.use_cache(max_entries=10)
+
+    factors = factorisation.factorise(12)
+    factors[2] = 5
+
+    factors = factorisation.factorise(12)
+    self.assertIs(type(factors), dict)
+    self.assertEqual(factors, {2: 2, 3: 1})
+    self.assertEqual(factorisation.cache_stats().hits, 1)
+
 
 if __name__ == '__main__':
   unittest.main()
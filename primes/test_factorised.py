@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
 
+from algutils.primes import factorisation
 from algutils.primes import factorised
+from algutils.primes import smallest_prime_factors
 
+import math
 import unittest
 
 
@@ -42,6 +45,13 @@ class TestFactorised(unittest.TestCase):
     self.assertEqual(f.factors, {2:1, 3: 1})
     self.assertEqual(int(f), 6)
 
+  def test_smallest_prime_factors_table(self):
+    smallest_prime_factors.get_table(min_lim=1000)
+
+    f = factorised.Factorised(992)
+    self.assertEqual(f.factors, {2: 5, 31: 1})
+    self.assertEqual(int(f), 992)
+
   def test_multiplication(self):
     a = factorised.Factorised(764)
     b = factorised.Factorised(992)
@@ -77,6 +87,89 @@ class TestFactorised(unittest.TestCase):
     self.assertEqual(f.factors, {3: e, 5: e, 11: e})
     self.assertEqual(int(f), 165**e)
 
+  def test_immutable(self):
+    a = factorised.Factorised(12)
+    b = a
+    a *= factorised.Factorised(5)
+
+    self.assertEqual(int(a), 60)
+    self.assertEqual(int(b), 12)
+
+    with self.assertRaises(AttributeError):
+      b.extra = 1
+
+  def test_gcd_lcm(self):
+    for m in range(1, 60):
+      for n in range(1, 60):
+        a = factorised.Factorised(m)
+        b = factorised.Factorised(n)
+
+        self.assertEqual(int(a.gcd(b)), math.gcd(m, n))
+        self.assertEqual(int(a.lcm(b)), math.lcm(m, n))
+
+  def test_divisors(self):
+    for n in range(1, 200):
+      f = factorised.Factorised(n)
+      want = [d for d in range(1, n + 1) if n % d == 0]
+
+      self.assertEqual(sorted(f.divisors()), want)
+      self.assertEqual(f.num_divisors(), len(want))
+      self.assertEqual(
+          f.totient(), sum(1 for k in range(1, n + 1) if math.gcd(k, n) == 1))
+
+    with self.assertRaises(ValueError):
+      (factorised.Factorised(2) / factorised.Factorised(3)).num_divisors()
+
+  def test_comparisons(self):
+    ns = list(range(1, 40))
+    fs = [factorised.Factorised(n) for n in ns]
+
+    for m, a in zip(ns, fs):
+      for n, b in zip(ns, fs):
+        self.assertEqual(a == b, m == n)
+        self.assertEqual(a < b, m < n)
+        self.assertEqual(a >= b, m >= n)
+
+    # Too close for floats: 2**64 + 1 against 2**64.
+    a = factorised.Factorised(2**64 + 1)
+    b = factorised.Factorised(2)**64
+    self.assertLess(b, a)
+    self.assertLess(b / a, factorised.Factorised(1))
+    self.assertEqual(hash(b), hash(factorised.Factorised(2**64)))
+
+  def test_to_int(self):
+    f = factorised.Factorised(2**10 * 3**5 * 7**3)**7
+
+    self.assertEqual(f.to_int(), (2**10 * 3**5 * 7**3)**7)
+    self.assertEqual(f.to_int(), int(f))  # Cached.
+    for mod in [1, 2, 10**9 + 7, 2**61 - 1]:
+      self.assertEqual(f.to_int(mod), (2**10 * 3**5 * 7**3)**7 % mod)
+
+    # Inverses modulo mod.
+    g = factorised.Factorised(5) / factorised.Factorised(3)
+    self.assertEqual(g.to_int(7), 5 * pow(3, -1, 7) % 7)
+    with self.assertRaises(ValueError):
+      g.to_int(9)
+
+  def test_to_int_large(self):
+    f = factorised.Factorised()
+    for n in range(1, 300):
+      f *= factorised.Factorised(n)
+
+    self.assertEqual(int(f), math.factorial(299))
+    self.assertEqual(int(f / factorised.Factorised(2)**400),
+                     math.factorial(299) // 2**400)
+
+  def test_cache(self):
+    factorisation.use_cache(max_entries=10)
+    try:
+      a = factorised.Factorised(2**61 - 1)
+      b = factorised.Factorised(2**61 - 1)
+      self.assertEqual(a, b)
+      self.assertEqual(factorisation.cache_stats().hits, 1)
+    finally:
+      factorisation.use_cache()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import factorisation
+from algutils.primes import multiplicative
+
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+
+
+def _divisors(n):
+  return [d for d in range(1, n + 1) if n % d == 0]
+
+
+class TestFunctions(unittest.TestCase):
+  def setUp(self):
+    self.lim = 1000
+    self.factors = [None] + [factorisation.factorise(n)
+                             for n in range(1, self.lim)]
+
+  def test_totient(self):
+    want = [0] + [sum(1 for k in range(1, n + 1) if math.gcd(k, n) == 1)
+                  for n in range(1, self.lim)]
+    self.assertEqual(multiplicative.totient(self.lim).tolist(), want)
+
+  def test_mobius(self):
+    want = [0] + [
+        0 if any(e > 1 for e in f.values()) else (-1)**len(f)
+        for f in self.factors[1:]]
+    self.assertEqual(multiplicative.mobius(self.lim).tolist(), want)
+
+  def test_divisors(self):
+    for n, sigma, sigma_2, d in zip(
+        range(1, self.lim),
+        multiplicative.divisor_sigma(self.lim, lo=1).tolist(),
+        multiplicative.divisor_sigma(self.lim, k=2, lo=1).tolist(),
+        multiplicative.divisor_count(self.lim, lo=1).tolist()):
+      divisors = _divisors(n)
+      self.assertEqual(sigma, sum(divisors))
+      self.assertEqual(sigma_2, sum(k * k for k in divisors))
+      self.assertEqual(d, len(divisors))
+
+  def test_big_omega(self):
+    want = [0] + [sum(f.values()) for f in self.factors[1:]]
+    self.assertEqual(multiplicative.big_omega(self.lim).tolist(), want)
+
+
+class TestSieve(unittest.TestCase):
+  def test_segments(self):
+    lim = 1000
+    want = multiplicative.totient(lim)
+
+    for segment_size in (1, 2, 7, 64):
+      with self.subTest(segment_size=segment_size), mock.patch.object(
+          multiplicative, "SEGMENT_SIZE", segment_size):
+        self.assertEqual(multiplicative.totient(lim).tolist(), want.tolist())
+        self.assertEqual(
+            multiplicative.totient(lim, lo=123).tolist(), want[123:].tolist())
+
+  def test_custom(self):
+    # n's largest squarefree divisor.
+    lim = 1000
+    got = multiplicative.sieve(lim, lambda p, e: p, lo=1)
+
+    for n, rad in zip(range(1, lim), got.tolist()):
+      self.assertEqual(rad, math.prod(factorisation.factorise(n)))
+
+  def test_iter_segments(self):
+    lim = 10**5
+    starts = []
+    values = []
+    for start, segment in multiplicative.iter_segments(
+        lim, lambda p, e: e + 1, lo=10):
+      starts.append(start)
+      values.append(segment)
+
+    self.assertEqual(starts[0], 10)
+    self.assertEqual(np.concatenate(values).tolist(),
+                     multiplicative.divisor_count(lim, lo=10).tolist())
+
+
+if __name__ == '__main__':
+  unittest.main()
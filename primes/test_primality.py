@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import primality
+from algutils.primes import primes
+
+import unittest
+
+import numpy as np
+
+
+class TestIsPrime(unittest.TestCase):
+  def test_small(self):
+    lim = 10**4
+    ps = set(primes.sieve(lim))
+
+    for n in range(-2, lim):
+      self.assertEqual(primality.is_prime(n), n in ps)
+
+  def test_pseudoprimes(self):
+    # Strong pseudoprimes to base 2 and to bases 2..37, a Carmichael number.
+    for n in (3215031751, 3825123056546413051, 318665857834031151167461,
+              211 * 421 * 631):
+      self.assertFalse(primality.is_prime(n))
+
+  def test_large(self):
+    m61 = 2**61 - 1
+    m89 = 2**89 - 1
+    m127 = 2**127 - 1
+
+    for p in (4759123129, 10**18 + 9, m61, m89, m127, 2**521 - 1):
+      self.assertTrue(primality.is_prime(p))
+
+    for n in (m61 * m89, m89 * m127, m127**2, 2**128 + 1):
+      self.assertFalse(primality.is_prime(n))
+
+
+class TestIsPrimeArray(unittest.TestCase):
+  def test_is_prime_array(self):
+    ns = np.arange(-2, 10**4)
+    want = [primality.is_prime(n) for n in ns.tolist()]
+
+    got = primality.is_prime_array(ns)
+    self.assertEqual(got.dtype, bool)
+    self.assertEqual(got.tolist(), want)
+
+    got = primality.is_prime_array(ns.reshape(2, -1))
+    self.assertEqual(got.ravel().tolist(), want)
+
+  def test_large(self):
+    ns = [4294967291, 3215031751, 4294967311, 2**61 - 1, 2**127 - 1, 2**128 + 1]
+    want = [True, False, True, True, True, False]
+
+    self.assertEqual(primality.is_prime_array(ns).tolist(), want)
+    self.assertEqual(
+        primality.is_prime_array(np.array(ns, dtype=object)).tolist(), want)
+
+
+  def test_64_bit(self):
+    rng = np.random.default_rng(0)
+    ns = np.concatenate([
+        rng.integers(1 << 32, 1 << 64, size=primality._MIN_64_BIT_BATCH,
+                     dtype=np.uint64) | 1,
+        np.array([3825123056546413051, 4759123129, 10**18 + 9, 2**61 - 1,
+                  2**64 - 59, 2**64 - 1, 4294967291 * 4294967279],
+                 dtype=np.uint64),
+    ])
+    want = [primality.is_prime(n) for n in ns.tolist()]
+
+    self.assertEqual(primality.is_prime_array(ns).tolist(), want)
+    self.assertEqual(
+        primality.is_prime_array(ns.astype(object)).tolist(), want)
+
+
+class TestJacobi(unittest.TestCase):
+  def test_jacobi(self):
+    self.assertEqual(primality.jacobi(1, 1), 1)
+    self.assertEqual(primality.jacobi(2, 7), 1)
+    self.assertEqual(primality.jacobi(3, 7), -1)
+    self.assertEqual(primality.jacobi(7, 21), 0)
+    self.assertEqual(primality.jacobi(-5, 9), 1)
+    self.assertEqual(primality.jacobi(1001, 9907), -1)
+
+    with self.assertRaises(ValueError):
+      primality.jacobi(3, 8)
+
+
+if __name__ == '__main__':
+  unittest.main()
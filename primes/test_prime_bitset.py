@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import prime_bitset
+from algutils.primes import primes
+
+import pickle
+import unittest
+
+import numpy as np
+
+
+class TestPrimeBitset(unittest.TestCase):
+  def test_cornercases(self):
+    for lim in range(8):
+      ps = primes.sieve(lim)
+      bitset = prime_bitset.PrimeBitset(ps, lim)
+
+      self.assertEqual(list(bitset), ps)
+      self.assertEqual(len(bitset), len(ps))
+      self.assertEqual(bitset.rank(lim), len(ps))
+
+  def test_contains(self):
+    lim = 1000
+    sps = set(primes.sieve(lim))
+    bitset = prime_bitset.PrimeBitset(primes.sieve(lim), lim)
+
+    for n in range(-10, lim + 100):
+      self.assertEqual(n in bitset, n in sps)
+
+    self.assertIn(np.int64(997), bitset)
+    self.assertNotIn("7", bitset)
+
+    ns = np.arange(lim)
+    self.assertEqual(bitset.lookup(ns).tolist(), [n in sps for n in range(lim)])
+
+  def test_rank_select(self):
+    lim = 10**4
+    ps = primes.sieve(lim)
+    bitset = prime_bitset.PrimeBitset(ps, lim)
+
+    rank = 0
+    for n in range(lim + 1):
+      self.assertEqual(bitset.rank(n), rank)
+      rank += n in bitset
+
+    for i, p in enumerate(ps):
+      self.assertEqual(bitset.select(i), p)
+
+    with self.assertRaises(IndexError):
+      bitset.select(len(ps))
+
+  def test_extended(self):
+    lim = 1000
+    ps = primes.sieve(lim)
+
+    for mid in [0, 4, 5, 6, 30, 31, 500, 1000]:
+      bitset = prime_bitset.PrimeBitset([p for p in ps if p < mid], mid)
+      bitset = bitset.extended([p for p in ps if p >= mid], lim)
+
+      self.assertEqual(list(bitset), ps)
+      self.assertEqual(len(bitset), len(ps))
+      self.assertEqual(bitset.lim, lim)
+
+  def test_set_comparisons(self):
+    lim = 100
+    sps = set(primes.sieve(lim))
+    bitset = prime_bitset.PrimeBitset(primes.sieve(lim), lim)
+
+    self.assertEqual(bitset, sps)
+    self.assertTrue({2, 3, 97} <= bitset)
+    self.assertTrue(bitset < sps | {100})
+    self.assertFalse({2, 4} <= bitset)
+    self.assertEqual(bitset & {2, 4, 5}, {2, 5})
+
+  def test_pickle(self):
+    lim = 1000
+    bitset = prime_bitset.PrimeBitset(primes.sieve(lim), lim)
+    other = pickle.loads(pickle.dumps(bitset))
+
+    self.assertEqual(other, bitset)
+    self.assertEqual(other.rank(lim), bitset.rank(lim))
+
+
+if __name__ == '__main__':
+  unittest.main()
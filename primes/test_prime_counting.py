@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import prime_counting
+from algutils.primes import primes
+
+import bisect
+import unittest
+
+
+class TestPrimePi(unittest.TestCase):
+  def test_cornercases(self):
+    self.assertEqual(prime_counting.prime_pi(-1), 0)
+    self.assertEqual(prime_counting.prime_pi(0), 0)
+    self.assertEqual(prime_counting.prime_pi(1), 0)
+    self.assertEqual(prime_counting.prime_pi(2), 1)
+    self.assertEqual(prime_counting.prime_pi(3), 2)
+    self.assertEqual(prime_counting.prime_pi(4), 2)
+
+  def test_prime_pi(self):
+    ps = primes.sieve(2000)
+
+    for x in range(2000):
+      self.assertEqual(prime_counting.prime_pi(x), bisect.bisect_right(ps, x))
+
+  def test_large(self):
+    self.assertEqual(prime_counting.prime_pi(10**6), len(primes.sieve(10**6)))
+    self.assertEqual(prime_counting.prime_pi(10**9), 50847534)
+    self.assertEqual(prime_counting.prime_pi(10**10), 455052511)
+
+
+class TestNthPrime(unittest.TestCase):
+  def test_nth_prime(self):
+    ps = primes.sieve(10**5)
+
+    for n in list(range(1, 1000)) + list(range(1000, len(ps) + 1, 97)):
+      self.assertEqual(prime_counting.nth_prime(n), ps[n - 1])
+
+  def test_large(self):
+    self.assertEqual(prime_counting.nth_prime(10**6), 15485863)
+    self.assertEqual(prime_counting.nth_prime(10**8), 2038074743)
+
+  def test_invalid(self):
+    with self.assertRaises(ValueError):
+      prime_counting.nth_prime(0)
+
+
+if __name__ == '__main__':
+  unittest.main()
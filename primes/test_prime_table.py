@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import cached_primes
+from algutils.primes import prime_table
+from algutils.primes import primes
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+
+class TestPackPrimes(unittest.TestCase):
+  def test_pack_primes(self):
+    lim = 1000
+    bits = prime_table.pack_primes(primes.sieve(lim), lim)
+
+    ns = np.arange(lim)
+    want = np.isin(ns, primes.sieve(lim))
+
+    self.assertEqual(prime_table.lookup(bits, ns).tolist(), want.tolist())
+
+
+class TestPrimeTableFile(unittest.TestCase):
+  def setUp(self):
+    self.dir = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.dir.name, "primes.bin")
+
+  def tearDown(self):
+    self.dir.cleanup()
+
+  def test_ensure(self):
+    table = prime_table.PrimeTableFile(self.path)
+    self.assertEqual(table.lim, 0)
+
+    for lim in [100, 1000, 10**5]:
+      table.ensure(lim)
+
+      self.assertGreaterEqual(table.lim, lim)
+      self.assertEqual(table.primes(lim).tolist(), primes.sieve(lim))
+
+    table.close()
+
+  def test_shared(self):
+    lim = 10**4
+    table = prime_table.PrimeTableFile(self.path)
+    table.ensure(lim)
+
+    other = prime_table.PrimeTableFile(self.path)
+    self.assertEqual(other.lim, table.lim)
+
+    sps = set(primes.sieve(lim))
+    for n in range(lim):
+      self.assertEqual(other.is_prime(n), n in sps)
+
+    # Growth by one instance is picked up by the other.
+    other.ensure(4 * lim)
+    table.ensure(4 * lim)
+    self.assertEqual(table.lim, other.lim)
+
+    other.close()
+    table.close()
+
+  def test_primes_set(self):
+    lim = 10**4
+    table = prime_table.PrimeTableFile(self.path)
+    table.ensure(lim)
+
+    got = table.primes_set()
+    want = set(primes.sieve(table.lim))
+
+    self.assertEqual(got, want)
+    self.assertEqual(len(got), len(want))
+    self.assertEqual(list(got), sorted(want))
+    self.assertNotIn(-3, got)
+    self.assertNotIn(table.lim + 1, got)
+
+    table.close()
+
+  def test_bad_file(self):
+    with open(self.path, "wb") as f:
+      f.write(b"\0" * 64)
+
+    with self.assertRaises(ValueError):
+      prime_table.PrimeTableFile(self.path)
+
+
+class TestUseTableFile(unittest.TestCase):
+  def test_use_table_file(self):
+    with tempfile.TemporaryDirectory() as d:
+      cached_primes.use_table_file(os.path.join(d, "primes.bin"))
+
+      try:
+        want = primes.sieve(1000)
+        got = cached_primes.get_primes_set(min_lim=1000)
+        self.assertIsInstance(got, prime_table.PrimeTableSet)
+        self.assertEqual(got & set(range(1000)), set(want))
+
+        # Nothing is copied out of the file until a list is asked for.
+        self.assertEqual(cached_primes._TABLE_FILE_PRIMES[1], [])
+        self.assertEqual(cached_primes.get_primes_list(min_lim=1000)[:len(want)],
+                         want)
+
+        want = primes.sieve(5000)
+        self.assertEqual(cached_primes.get_primes_list(min_lim=5000)[:len(want)],
+                         want)
+
+        ns = np.arange(1000)
+        self.assertEqual(cached_primes.is_prime_array(ns).tolist(),
+                         np.isin(ns, want).tolist())
+      finally:
+        cached_primes.use_table_file(None)
+
+
+if __name__ == '__main__':
+  unittest.main()
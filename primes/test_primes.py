@@ -4,6 +4,9 @@
 from algutils.primes import primes
 
 import unittest
+from unittest import mock
+
+import numpy as np
 
 
 class TestSieve(unittest.TestCase):
@@ -28,6 +31,70 @@ class TestSieve(unittest.TestCase):
       for i in range(2, p):
         self.assertNotEqual(p % i, 0)
 
+  def test_compact(self):
+    self.assertEqual(primes.sieve(2, compact=True).tolist(), [])
+    self.assertEqual(primes.sieve(3, compact=True).tolist(), [2])
+
+    ps = primes.sieve(10**5, compact=True)
+
+    self.assertEqual(ps.dtype, np.uint32)
+    self.assertEqual(ps.tolist(), primes.sieve(10**5))
+
+  def test_segments(self):
+    lim = 1000
+    want = primes.sieve(lim)
+
+    for segment_size in (1, 2, 7, 64):
+      with self.subTest(segment_size=segment_size), mock.patch.object(
+          primes, "SEGMENT_SIZE", segment_size):
+        self.assertEqual(primes.sieve(lim), want)
+
+  def test_parallel(self):
+    lim = 10**5
+    want = primes.sieve(lim)
+
+    with mock.patch.object(primes, "SEGMENT_SIZE", 1000):
+      self.assertEqual(primes.sieve(lim, processes=2), want)
+      self.assertEqual(
+          primes.sieve(lim, compact=True, processes=None).tolist(), want)
+
+    self.assertEqual(primes.sieve(4, processes=2), [2, 3])
+
+  def test_start(self):
+    lim = 1000
+    want = primes.sieve(lim)
+
+    for start in (0, 2, 3, 4, 97, 98, 500, 999, 1000, 2000):
+      self.assertEqual(
+          primes.sieve(lim, start=start), [p for p in want if p >= start])
+
+
+class TestIterPrimes(unittest.TestCase):
+  def test_cornercases(self):
+    self.assertEqual(list(primes.iter_primes(stop=0)), [])
+    self.assertEqual(list(primes.iter_primes(stop=3)), [2])
+    self.assertEqual(list(primes.iter_primes(start=-5, stop=4)), [2, 3])
+    self.assertEqual(list(primes.iter_primes(start=3, stop=4)), [3])
+    self.assertEqual(list(primes.iter_primes(start=8, stop=11)), [])
+
+  def test_range(self):
+    want = primes.sieve(1000)
+
+    self.assertEqual(list(primes.iter_primes(stop=1000)), want)
+    self.assertEqual(
+        list(primes.iter_primes(start=100, stop=1000)),
+        [p for p in want if p >= 100])
+
+    with mock.patch.object(primes, "SEGMENT_SIZE", 7):
+      self.assertEqual(list(primes.iter_primes(stop=1000)), want)
+
+  def test_unbounded(self):
+    it = primes.iter_primes(start=10**12)
+
+    self.assertEqual(
+        [next(it) for _ in range(3)],
+        [1000000000039, 1000000000061, 1000000000063])
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import siqs
+
+import unittest
+
+
+class TestFindFactor(unittest.TestCase):
+  def test_find_factor(self):
+    p = 1000000000000000003
+    q = 10000000000000000051
+    d = siqs.find_factor(p * q)
+
+    self.assertIn(d, (p, q))
+
+  def test_multiple_factors(self):
+    n = 1000003 * 1000033 * 1000037 * 1000039
+    d = siqs.find_factor(n)
+
+    self.assertLess(1, d)
+    self.assertLess(d, n)
+    self.assertEqual(n % d, 0)
+
+  def test_processes(self):
+    p = 300000000000089
+    q = 7000000000000037
+    d = siqs.find_factor(p * q, processes=2)
+
+    self.assertIn(d, (p, q))
+
+
+if __name__ == '__main__':
+  unittest.main()
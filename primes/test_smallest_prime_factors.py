@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+
+from algutils.primes import smallest_prime_factors
+
+import unittest
+
+
+class TestGetTable(unittest.TestCase):
+  def test_get_table(self):
+    lim = 1000
+    table = smallest_prime_factors.get_table(min_lim=lim)
+
+    self.assertGreaterEqual(len(table), lim)
+    self.assertGreaterEqual(smallest_prime_factors.lim(), lim)
+    self.assertEqual(table[:2].tolist(), [0, 0])
+
+    for n in range(2, lim):
+      want = next(p for p in range(2, n + 1) if n % p == 0)
+      self.assertEqual(table[n], want)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import json
+import os
+import tempfile
+
+from algutils import bench
+
+
+class TestCompare(unittest.TestCase):
+    def test_compare(self):
+        baseline = {
+            "a": bench.Result(seconds=1.0, peak_bytes=1000),
+            "b": bench.Result(seconds=1.0, peak_bytes=1000),
+            "c": bench.Result(seconds=1.0, peak_bytes=1000),
+        }
+        results = {
+            "a": bench.Result(seconds=1.1, peak_bytes=1050),
+            "b": bench.Result(seconds=1.5, peak_bytes=1000),
+            "c": bench.Result(seconds=0.5, peak_bytes=2000),
+            "d": bench.Result(seconds=9.0, peak_bytes=9000),
+        }
+
+        regressions = bench.compare(
+            results, baseline, tolerance=0.2, memory_tolerance=0.1
+        )
+
+        self.assertEqual(
+            [(r.name, r.metric) for r in regressions],
+            [("b", "seconds"), ("c", "peak_bytes")],
+        )
+
+    def test_json(self):
+        results = {"a": bench.Result(seconds=0.25, peak_bytes=1000)}
+        data = json.loads(json.dumps(bench.to_json(suite="primes", results=results)))
+
+        self.assertEqual(data["suite"], "primes")
+        self.assertEqual(bench.from_json(data), results)
+
+
+class TestMain(unittest.TestCase):
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "results.json")
+            argv = ["primes", "--repeat=1", "--only=sieve/1e4"]
+
+            self.assertEqual(bench.main(argv + [f"--output={path}"]), 0)
+            self.assertEqual(
+                bench.main(argv + [f"--baseline={path}", "--tolerance=100"]), 0
+            )
+
+            with open(path) as f:
+                self.assertEqual(list(json.load(f)["results"]), ["sieve/1e4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
 import unittest
 
 import math
+import random
 import re
 import string
 
+import numpy as np
+
 from algutils import utils
-from algutils.braille_canvas import BrailleCanvas
+from algutils.braille_canvas import BrailleCanvas, ScrollingBrailleCanvas
+from algutils.np_array_to_braille import np_array_to_braille
 
 
 class BaseBrailleCanvasTestCase(unittest.TestCase):
@@ -93,3 +97,302 @@ class TestBrailleCanvas(BaseBrailleCanvasTestCase):
                    F  ⠊⠉⠉⠁
             """,
         )
+
+
+class TestBatchDrawing(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.starts = rng.uniform(-5, 45, size=(50, 2))
+        self.stops = rng.uniform(-5, 45, size=(50, 2))
+
+    def test_draw_points(self) -> None:
+        one_by_one = BrailleCanvas(char_rows=10, char_columns=20)
+        for yx in self.starts:
+            one_by_one.draw_point(yx)
+
+        batch = BrailleCanvas(char_rows=10, char_columns=20)
+        batch.draw_points(self.starts)
+
+        np.testing.assert_array_equal(batch.dots, one_by_one.dots)
+
+    def test_draw_lines(self) -> None:
+        for offset in [0.0, 3.0]:
+            one_by_one = BrailleCanvas(char_rows=10, char_columns=20)
+            for start, stop in zip(self.starts, self.stops):
+                one_by_one.draw_line(start, stop, offset=offset)
+
+            batch = BrailleCanvas(char_rows=10, char_columns=20)
+            batch.draw_lines(self.starts, self.stops, offset=offset)
+
+            np.testing.assert_array_equal(batch.dots, one_by_one.dots)
+
+    def test_draw_polyline(self) -> None:
+        one_by_one = BrailleCanvas(char_rows=10, char_columns=20)
+        for start, stop in zip(self.starts[:-1], self.starts[1:]):
+            one_by_one.draw_line(start, stop)
+
+        batch = BrailleCanvas(char_rows=10, char_columns=20)
+        batch.draw_polyline(self.starts)
+
+        np.testing.assert_array_equal(batch.dots, one_by_one.dots)
+
+    def test_seeded(self) -> None:
+        # Lines through the midpoints between dots, where the jiggle decides
+        # which dots they get, drawn the same for the same seed of random.
+        bc = BrailleCanvas(char_rows=10, char_columns=20)
+        ys = np.repeat(bc._dots_ys[:-1] + np.diff(bc._dots_ys) / 2, 2)
+        xs = np.tile([0.0, 30.0], len(ys) // 2)
+        yx_coords = np.stack([ys, xs], axis=1)
+
+        drawings = []
+        for np_seed in [1, 2]:
+            random.seed(0)
+            np.random.seed(np_seed)
+            bc = BrailleCanvas(char_rows=10, char_columns=20)
+            bc.draw_lines(yx_coords[0::2], yx_coords[1::2])
+            bc.draw_arrow((1.0, 1.0), (20.0, 30.0))
+            drawings.append(bc.dots)
+
+        np.testing.assert_array_equal(*drawings)
+
+    def test_empty(self) -> None:
+        bc = BrailleCanvas(char_rows=10, char_columns=20)
+        bc.draw_points(np.empty((0, 2)))
+        bc.draw_lines([], [])
+        bc.draw_polyline([(1.0, 1.0)])
+
+        self.assertFalse(bc.dots.any())
+
+
+class TestCoordsToDots(unittest.TestCase):
+    def test_dots_coords(self) -> None:
+        bc = BrailleCanvas(char_rows=5, char_columns=7)
+        dots_rows_cols = np.argwhere(np.ones_like(bc.dots))
+        yx_coords = [bc._dot_row_col_to_yx_coords(tuple(rc)) for rc in dots_rows_cols]
+
+        rows, cols = bc.coords_to_dots(yx_coords)
+
+        np.testing.assert_array_equal(rows, dots_rows_cols[:, 0])
+        np.testing.assert_array_equal(cols, dots_rows_cols[:, 1])
+
+    def test_matches_scalar(self) -> None:
+        bc = BrailleCanvas(char_rows=5, char_columns=7)
+        yx_coords = np.random.default_rng(0).uniform(-5, 30, size=(1000, 2))
+
+        rows, cols = bc.coords_to_dots(yx_coords)
+
+        self.assertEqual(
+            list(zip(rows.tolist(), cols.tolist())),
+            [bc._closest_dot_row_col(yx) for yx in yx_coords.tolist()],
+        )
+
+
+class TestCells(unittest.TestCase):
+    def test_dots_round_trip(self) -> None:
+        dots = np.random.default_rng(0).random((12, 10)) < 0.5
+
+        bc = BrailleCanvas(char_rows=3, char_columns=5)
+        bc.dots = dots
+
+        np.testing.assert_array_equal(bc.dots, dots)
+        self.assertEqual(str(bc), np_array_to_braille(dots))
+
+    def test_cells(self) -> None:
+        bc = BrailleCanvas(char_rows=1, char_columns=2)
+        dots = bc.dots
+        dots[0, 1] = dots[3, 0] = dots[3, 3] = True
+        bc.dots = dots
+
+        np.testing.assert_array_equal(bc.cells, [[0b01000010, 0b10000000]])
+        self.assertEqual(str(bc), "⡈⢀")
+
+    def test_dots_write_through(self) -> None:
+        bc = BrailleCanvas(char_rows=1, char_columns=2)
+        bc.draw_point((3.0, 1.475))
+        str(bc)
+
+        bc.dots[0, 1] = True
+        bc.dots[3, :] = [True, False, False, True]
+        bc.dots[bc.dots] = False
+        bc.dots[1, 1:3] = True
+
+        np.testing.assert_array_equal(bc.cells, [[0b00001000, 0b00000100]])
+        self.assertEqual(str(bc), np_array_to_braille(bc.dots))
+
+        # Other changes raise instead of being lost, but copies can change.
+        with self.assertRaises(ValueError):
+            bc.dots[0][0] = True
+        with self.assertRaises(ValueError):
+            dots = bc.dots
+            dots |= True
+
+        dots = bc.dots.copy()
+        dots[0, 0] = True
+        self.assertFalse(bc.dots[0, 0])
+
+
+class TestIncrementalRendering(unittest.TestCase):
+    def test_matches_full_render(self) -> None:
+        rng = np.random.default_rng(0)
+        bc = BrailleCanvas(char_rows=6, char_columns=10)
+
+        for i in range(20):
+            start, stop = rng.uniform(0, 25, size=(2, 2))
+            if i % 3 == 0:
+                bc.write_text(start, f"t{i}")
+            else:
+                bc.draw_line(start, stop)
+            rendered = str(bc)
+
+            bc.mark_dirty()
+            self.assertEqual(rendered, str(bc))
+
+    def test_dots_setter(self) -> None:
+        bc = BrailleCanvas(char_rows=1, char_columns=1)
+        str(bc)
+        bc.dots = np.ones_like(bc.dots)
+
+        self.assertEqual(str(bc), "⣿")
+
+    def test_no_columns(self) -> None:
+        self.assertEqual(str(BrailleCanvas(char_rows=2, char_columns=0)), "\n")
+
+
+class TestScrollingBrailleCanvas(unittest.TestCase):
+    def test_scroll(self) -> None:
+        rng = np.random.default_rng(0)
+        cells = rng.integers(0, 256, size=(3, 7), dtype=np.uint8)
+
+        bc = ScrollingBrailleCanvas(char_rows=3, char_columns=7)
+        bc.cells = cells
+        for char_columns in [2, 3, 4]:
+            bc.scroll(char_columns)
+            cells = np.concatenate(
+                [cells[:, char_columns:], np.zeros((3, char_columns), np.uint8)],
+                axis=1,
+            )
+            np.testing.assert_array_equal(bc.cells, cells)
+
+            yx_coords = rng.uniform(0, 14, size=(20, 2))
+            bc.draw_points(yx_coords)
+            expected = BrailleCanvas(char_rows=3, char_columns=7)
+            expected.cells = cells
+            expected.draw_points(yx_coords)
+            cells = expected.cells
+
+            np.testing.assert_array_equal(bc.cells, cells)
+            self.assertEqual(str(bc), str(expected))
+
+    def test_draw_after_scroll(self) -> None:
+        bc = ScrollingBrailleCanvas(char_rows=2, char_columns=5)
+        bc.draw_point((0.0, 0.0))
+        bc.write_text((4.4, 0.0), "a")
+        bc.write_text((4.4, 4.0), "b")
+        bc.scroll()
+        bc.draw_point((4.4, 8.0))
+
+        self.assertEqual(str(bc), "     \n b  ⠁")
+
+    def test_scroll_empty(self) -> None:
+        bc = ScrollingBrailleCanvas(char_rows=2, char_columns=0)
+        bc.scroll()
+
+        self.assertEqual(bc.cells.shape, (2, 0))
+
+    def test_cells_read_only(self) -> None:
+        bc = ScrollingBrailleCanvas(char_rows=1, char_columns=2)
+
+        with self.assertRaises(ValueError):
+            bc.cells[0, 0] = 255
+
+
+def _count_components(dots: np.ndarray) -> int:
+    # Of dots touching each other, diagonally too.
+    unvisited = set(map(tuple, np.argwhere(dots).tolist()))
+    count = 0
+    while unvisited:
+        count += 1
+        stack = [unvisited.pop()]
+        while stack:
+            y, x = stack.pop()
+            for dy in [-1, 0, 1]:
+                for dx in [-1, 0, 1]:
+                    if (y + dy, x + dx) in unvisited:
+                        unvisited.remove((y + dy, x + dx))
+                        stack.append((y + dy, x + dx))
+
+    return count
+
+
+class TestFilledPrimitives(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bc = BrailleCanvas(char_rows=6, char_columns=12)
+        self.ys, self.xs = np.meshgrid(
+            self.bc._dots_ys, self.bc._dots_xs, indexing="ij"
+        )
+
+    def test_fill_rect(self) -> None:
+        self.bc.fill_rect((20.0, 3.0), (5.5, 17.0))
+
+        np.testing.assert_array_equal(
+            self.bc.dots,
+            (5.5 <= self.ys) & (self.ys <= 20.0) & (3.0 <= self.xs) & (self.xs <= 17.0),
+        )
+
+    def test_fill_circle(self) -> None:
+        self.bc.fill_circle((12.0, 10.0), 7.5)
+
+        np.testing.assert_array_equal(
+            self.bc.dots, (self.ys - 12.0) ** 2 + (self.xs - 10.0) ** 2 <= 7.5**2
+        )
+
+    def test_fill_polygon(self) -> None:
+        # A pentagram, whose centre is outside by the even-odd rule.
+        angles = np.arange(5) * 4 * math.pi / 5
+        vertices = np.stack([12 - 11 * np.cos(angles), 12 + 11 * np.sin(angles)], 1)
+
+        self.bc.fill_polygon(vertices)
+
+        dots = self.bc.dots
+        self.assertFalse(dots[self.bc.coords_to_dots([(12.0, 12.0)])].any())
+        self.assertTrue(dots[self.bc.coords_to_dots([(3.0, 12.0)])].all())
+        self.assertFalse(dots[self.bc.coords_to_dots([(1.0, 1.0)])].any())
+
+    def test_draw_circle(self) -> None:
+        rng = np.random.default_rng(0)
+        circles = [(12.0, 12.0, 9.0), (12.5, 14.3, 7.77)] + [
+            (cy, cx, r)
+            for r in rng.uniform(2.5, 10.0, size=20)
+            for cy, cx in [rng.uniform([r, r], [26.4 - r, 24.0 - r])]
+        ]
+
+        for cy, cx, r in circles:
+            with self.subTest(centre=(cy, cx), radius=r):
+                bc = BrailleCanvas(char_rows=6, char_columns=12)
+                bc.draw_circle((cy, cx), r)
+                dots = bc.dots
+
+                # At most half the widest gap between dots away.
+                distances = np.hypot(self.ys - cy, self.xs - cx)[dots]
+                self.assertLessEqual(np.abs(distances - r).max(), 1.05 + 1e-9)
+
+                # One dot thick: no dot has more than 2 others around it.
+                padded = np.pad(dots, 1).astype(int)
+                neighbours = sum(
+                    np.roll(np.roll(padded, dy, axis=0), dx, axis=1)
+                    for dy in [-1, 0, 1]
+                    for dx in [-1, 0, 1]
+                    if dy or dx
+                )[1:-1, 1:-1]
+                self.assertLessEqual(neighbours[dots].max(), 2)
+
+                # Without gaps: every dot can be reached from any other.
+                self.assertEqual(_count_components(dots), 1)
+
+    def test_draw_circle_zero_radius(self) -> None:
+        self.bc.draw_circle((12.0, 12.0), 0.0)
+
+        np.testing.assert_array_equal(
+            np.argwhere(self.bc.dots),
+            np.stack(self.bc.coords_to_dots([(12.0, 12.0)]), axis=1),
+        )
@@ -0,0 +1,81 @@
+import unittest
+
+import random
+import re
+
+from algutils.frame_differ import FrameDiffer, full_repaint, render_diff
+
+
+def _apply(screen: list[list[str]], output: str) -> None:
+    # A terminal understanding just what render_diff writes.
+    row = col = 0
+    for token in re.findall(r"\x1b\[(?:\d+;\d+)?[HJK]|\r\n|.", output):
+        if token == "\r\n":
+            row, col = row + 1, 0
+        elif token.startswith("\x1b["):
+            if token.endswith("H"):
+                row, col = [int(n) - 1 for n in (token[2:-1] or "1;1").split(";")]
+            elif token.endswith("K"):
+                screen[row][col:] = [" "] * (len(screen[row]) - col)
+            else:
+                screen[row][col:] = [" "] * (len(screen[row]) - col)
+                for line in screen[row + 1 :]:
+                    line[:] = [" "] * len(line)
+        else:
+            screen[row][col] = token
+            col += 1
+
+
+def _screen_string(screen: list[list[str]]) -> str:
+    return "\n".join("".join(line).rstrip() for line in screen).rstrip("\n")
+
+
+def _random_frame(rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choice(" ⠁⠂⡀⣿ab") for _ in range(rng.randint(0, 12)))
+        for _ in range(rng.randint(1, 8))
+    )
+
+
+class TestFrameDiffer(unittest.TestCase):
+    def test_random_frames(self) -> None:
+        rng = random.Random(0)
+
+        for full_repaint_fallback in [False, True]:
+            screen = [[" "] * 20 for _ in range(10)]
+            differ = FrameDiffer(full_repaint_fallback=full_repaint_fallback)
+
+            frame = ""
+            for _ in range(200):
+                if rng.random() < 0.5:
+                    frame = _random_frame(rng)
+                else:
+                    lines = frame.split("\n")
+                    row = rng.randrange(len(lines))
+                    lines[row] = lines[row][:3] + "x" + lines[row][4:]
+                    frame = "\n".join(lines)
+
+                _apply(screen, differ.diff(frame))
+
+                self.assertEqual(
+                    _screen_string(screen),
+                    "\n".join(line.rstrip() for line in frame.split("\n")).rstrip(
+                        "\n"
+                    ),
+                )
+
+    def test_small_change(self) -> None:
+        previous = "⣿" * 100 + "\n" + "⣿" * 100
+        frame = "⣿" * 100 + "\n" + "⣿" * 50 + "⠁⠁ ⠁" + "⣿" * 46
+
+        self.assertEqual(render_diff(previous, frame), "\x1b[2;51H⠁⠁ ⠁")
+
+    def test_full_repaint_fallback(self) -> None:
+        previous = "aaaaa\nbbbbb\nccccc"
+        frame = "ddddd\neeeee\nfffff"
+
+        self.assertEqual(render_diff(previous, frame), full_repaint(frame))
+        self.assertNotEqual(
+            render_diff(previous, frame, full_repaint_fallback=False),
+            full_repaint(frame),
+        )